@@ -22,6 +22,7 @@ setup(name='ubxtranslator',
       author_email='dalymople@gmail.com',
       license='GNU GPL v3',
       packages=['ubxtranslator'],
+      extras_require={'numpy': ['numpy']},
       zip_safe=False,
       test_suite='nose.collector',
       tests_require=['nose'],
@@ -0,0 +1,90 @@
+"""An asyncio protocol decoding UBX frames as the data is received"""
+
+import asyncio
+from typing import Any, Callable, Optional, Tuple
+
+from .core import Parser
+
+__all__ = ['UBXProtocol', ]
+
+
+class UBXProtocol(asyncio.Protocol):
+    """Decodes the frames received by an asyncio transport within `data_received`.
+
+    Unlike `Parser.receive_from_async` there is no coroutine step per byte or per frame, every chunk delivered
+    by the transport is passed to `Parser.feed` and all the complete messages are handled at once. Use it with
+    `loop.create_connection`, `loop.connect_read_pipe` or any transport that calls `data_received`, such as the
+    serial transport of pyserial-asyncio.
+
+    If `callback` is provided it is called with the class name, message name and payload of each message.
+    Otherwise the messages are queued and can be awaited with `get` or iterated with `async for`, which stops
+    once the connection is closed and the queue is empty. If `max_queue` is set the transport is paused while
+    that many messages are waiting and resumed once the queue is half empty.
+
+    The parser must not be buffered and should not be used for anything else, see `Parser.feed`. If provided
+    `on_error` is called with the ValueError describing each invalid frame.
+    """
+
+    def __init__(self, parser: Parser, callback: Optional[Callable[[str, str, Any], Any]] = None,
+                 on_error: Optional[Callable[[ValueError], Any]] = None, max_queue: int = 0):
+        # noinspection PyProtectedMember
+        if parser._buffered:
+            raise ValueError("Cannot use a buffered parser, the input buffer belongs to receive_from")
+
+        self.parser = parser
+        self.transport = None
+        self._callback = callback
+        self._on_error = on_error
+        self._max_queue = max_queue
+        self._queue = asyncio.Queue()
+        self._paused = False
+        self._exc = None
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        msgs = self.parser.feed(data, self._on_error)
+
+        if self._callback is not None:
+            for msg in msgs:
+                self._callback(*msg)
+            return
+
+        for msg in msgs:
+            self._queue.put_nowait(msg)
+
+        if self._max_queue and not self._paused and self._queue.qsize() >= self._max_queue:
+            self._paused = True
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._exc = exc
+        # Wakes up the consumer once the messages already received are handled
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Tuple[str, str, Any]:
+        """Return the next message received, waiting for one if needed.
+
+        Raise IOError once the connection is closed and every message received has been returned.
+        """
+        msg = await self._queue.get()
+        if msg is None:
+            # Keep the marker for any further calls
+            self._queue.put_nowait(None)
+            raise IOError("The connection was closed") from self._exc
+
+        if self._paused and self._queue.qsize() <= self._max_queue // 2:
+            self._paused = False
+            self.transport.resume_reading()
+
+        return msg
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[str, str, Any]:
+        try:
+            return await self.get()
+        except IOError:
+            raise StopAsyncIteration
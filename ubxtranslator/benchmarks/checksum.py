@@ -0,0 +1,27 @@
+"""A benchmark of the Fletcher checksum against the byte by byte reference implementation.
+
+Run with `python -m ubxtranslator.benchmarks.checksum`
+"""
+
+import os
+import timeit
+
+from ubxtranslator.core import Parser, _numpy
+
+
+def run(number: int = 200):
+    print('NumPy is {}'.format('installed' if _numpy() is not None else 'not installed'))
+    print('{:>6} {:>14} {:>14} {:>8}'.format('bytes', 'reference us', 'checksum us', 'speedup'))
+    for size in (8, 64, 256, 1024, 2048, 4096, 8192):
+        payload = os.urandom(size)
+        assert Parser._generate_fletcher_checksum(payload) == Parser._fletcher_checksum_reference(payload)
+
+        reference = timeit.timeit(lambda: Parser._fletcher_checksum_reference(payload), number=number)
+        checksum = timeit.timeit(lambda: Parser._generate_fletcher_checksum(payload), number=number)
+
+        print('{:>6} {:>14.2f} {:>14.2f} {:>7.1f}x'.format(
+            size, reference / number * 1e6, checksum / number * 1e6, reference / checksum))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,31 @@
+"""A benchmark of building NAV-PVT packets with the generic packer and the compiled encoder.
+
+Run with `python -m ubxtranslator.benchmarks.pack`
+"""
+
+import timeit
+
+from ubxtranslator.core import Cls, Message, Parser
+from ubxtranslator.predefined import NAV_CLS
+
+
+def run(number: int = 50000):
+    pvt = NAV_CLS[0x07]
+    generic = Parser([Cls(NAV_CLS.id_, NAV_CLS.name, [pvt])])
+    compiled = Parser([Cls(NAV_CLS.id_, NAV_CLS.name, [Message(pvt.id_, pvt.name, pvt._fields).compile()])])
+
+    msg_dict = generic.prepare_msg(NAV_CLS.name, pvt.name)
+    buff = bytearray()
+
+    assert generic._pack_for_transfer(msg_dict) == compiled._pack_for_transfer(msg_dict)
+
+    generic_us = timeit.timeit(lambda: generic._pack_for_transfer(msg_dict), number=number) / number * 1e6
+    compiled_us = timeit.timeit(lambda: compiled.pack_into(msg_dict, buff), number=number) / number * 1e6
+
+    print('generic  {:.2f} us'.format(generic_us))
+    print('compiled {:.2f} us'.format(compiled_us))
+    print('speedup  {:.1f}x'.format(generic_us / compiled_us))
+
+
+if __name__ == '__main__':
+    run()
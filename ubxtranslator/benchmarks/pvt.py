@@ -0,0 +1,28 @@
+"""A benchmark of decoding NAV-PVT messages with the generic parser and the compiled decoder.
+
+Run with `python -m ubxtranslator.benchmarks.pvt`
+"""
+
+import timeit
+
+from ubxtranslator.core import Message
+from ubxtranslator.predefined import NAV_CLS
+
+
+def run(number: int = 100000):
+    generic = NAV_CLS[0x07]
+    compiled = Message(generic.id_, generic.name, generic._fields).compile()
+    payload = bytes(range(generic._fixed_size))
+
+    assert generic.parse(payload) == compiled.parse(payload)
+
+    generic_us = timeit.timeit(lambda: generic.parse(payload), number=number) / number * 1e6
+    compiled_us = timeit.timeit(lambda: compiled.parse(payload), number=number) / number * 1e6
+
+    print('generic  {:.2f} us'.format(generic_us))
+    print('compiled {:.2f} us'.format(compiled_us))
+    print('speedup  {:.1f}x'.format(generic_us / compiled_us))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,36 @@
+"""A benchmark of decoding RXM-RAWX messages with an increasing number of measurement blocks.
+
+The payload length check should take the same time for any number of blocks, and the decode time per block
+should stay flat as the number of blocks grows.
+
+Run with `python -m ubxtranslator.benchmarks.rawx`
+"""
+
+import struct
+import timeit
+
+from ubxtranslator.predefined import RXM_CLS
+
+
+def rawx_payload(blocks: int) -> bytes:
+    """Return a RXM-RAWX payload with the given number of measurement blocks."""
+    head = struct.pack('<dHbBBB2x', 123456.789, 2200, 18, blocks, 0x03, 1)
+    block = struct.pack('<ddfBBBBHBBBBBx', 2.1e7, 1.1e8, -1234.5, 0, 5, 0, 0, 64000, 45, 0x0F, 0x0F, 0x0F, 0x07)
+    return head + block * blocks
+
+
+def run(number: int = 2000):
+    rawx = RXM_CLS[0x15]
+
+    print('{:>6} {:>16} {:>12} {:>16}'.format('blocks', 'length check us', 'parse us', 'parse us/block'))
+    for blocks in (1, 10, 25, 50, 75, 100):
+        payload = rawx_payload(blocks)
+
+        check = timeit.timeit(lambda: rawx.check_payload_length(len(payload)), number=number) / number * 1e6
+        parse = timeit.timeit(lambda: rawx.parse(payload), number=number // 10) / (number // 10) * 1e6
+
+        print('{:>6} {:>16.3f} {:>12.1f} {:>16.2f}'.format(blocks, check, parse, parse / blocks))
+
+
+if __name__ == '__main__':
+    run()
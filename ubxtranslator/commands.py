@@ -0,0 +1,266 @@
+"""Send commands and match the ACK-ACK and ACK-NAK replies of the receiver to them"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .core import Parser
+from .predefined import ACK_CLS
+
+__all__ = ['Commander', 'AsyncCommander', ]
+
+_ACK_ID = 0x01
+_NAK_ID = 0x00
+
+
+class _CommanderBase:
+    """Tracks the commands waiting for a reply and resolves their futures from the frames received."""
+
+    def __init__(self, parser: Parser, window: int, on_message: Optional[Callable[[str, str, Any], Any]],
+                 on_error: Optional[Callable[[ValueError], Any]]):
+        if window < 1:
+            raise ValueError("The window must be at least 1, not {}".format(window))
+        if ACK_CLS.id_ not in parser.classes:
+            parser.register_cls(ACK_CLS)
+
+        self.parser = parser
+        self.window = window
+        self._on_message = on_message
+        self._on_error = on_error
+        # (class id, message id): futures of the commands sent, oldest first
+        self._pending: Dict[Tuple[int, int], deque] = {}
+        self._in_flight = 0
+
+    def __len__(self) -> int:
+        """Return the number of commands waiting for a reply."""
+        return self._in_flight
+
+    def _track(self, msg_dict: dict, future) -> Any:
+        # noinspection PyProtectedMember
+        self._pending.setdefault(self.parser._msg_ids(msg_dict), deque()).append(future)
+        self._in_flight += 1
+        return future
+
+    def _untrack(self, msg_dict: dict, future):
+        """Forget a command that could not be sent, unless a reply has already resolved it."""
+        # noinspection PyProtectedMember
+        futures = self._pending.get(self.parser._msg_ids(msg_dict))
+        if futures and future in futures:
+            futures.remove(future)
+            self._in_flight -= 1
+            self._resolved()
+
+    def _handle(self, data: bytes):
+        """Feed data to the parser, resolve the commands replied to and pass on any other messages."""
+        for msg_cls, msg_id, payload in self.parser.feed_frames(data, self._on_error):
+            if msg_cls == ACK_CLS.id_ and msg_id in (_ACK_ID, _NAK_ID) and len(payload) == 2:
+                futures = self._pending.get((payload[0], payload[1]))
+                if futures:
+                    future = futures.popleft()
+                    self._in_flight -= 1
+                    self._resolved()
+                    if not future.done():
+                        future.set_result(msg_id == _ACK_ID)
+                    continue
+
+            if self._on_message is not None:
+                # noinspection PyProtectedMember
+                self._on_message(*self.parser._decode(msg_cls, msg_id, payload))
+
+    def _resolved(self):
+        """Called when a place in the window is freed."""
+
+    def _fail_all(self, exc: Exception):
+        """Fail the futures of every command waiting for a reply."""
+        for futures in self._pending.values():
+            while futures:
+                future = futures.popleft()
+                self._in_flight -= 1
+                self._resolved()
+                if not future.done():
+                    future.set_exception(exc)
+
+
+class Commander(_CommanderBase):
+    """Sends commands over a stream and matches the ACK-ACK and ACK-NAK replies to them.
+
+    Up to `window` commands are sent before the first reply is awaited, so configuring a receiver costs
+    about one round trip per window rather than per command. `send` returns a future that resolves to True
+    once the command is acknowledged and to False if it is rejected. The replies are matched to the oldest
+    command sent with the same class and message id, as the receiver replies in order.
+
+    Only commands that the receiver replies to, such as those of the CFG class, should be sent this way,
+    other messages never free their place in the window. Use `Parser.transfer_to` for those.
+
+    The stream is read by `pump`, which is called while the window is full and by `wait`. Messages other than
+    the replies are decoded and passed to `on_message` if provided, so the interleaved navigation messages
+    are not lost. The parser must not be buffered as the frames are decoded by `Parser.feed_frames`, if
+    provided `on_error` is called with the ValueError describing each invalid frame. The ACK class is
+    registered with the parser if it is not already.
+    """
+
+    def __init__(self, parser: Parser, stream, window: int = 8,
+                 on_message: Optional[Callable[[str, str, Any], Any]] = None,
+                 on_error: Optional[Callable[[ValueError], Any]] = None):
+        super().__init__(parser, window, on_message, on_error)
+        self.stream = stream
+
+    def send(self, msg_dict: dict, timeout: Optional[float] = None) -> Future:
+        """Send a command and return the future of its reply, see `Parser.prepare_msg` for the dictionary.
+
+        If the window is full the stream is read until a reply frees a place, raise TimeoutError if this
+        takes more than timeout seconds.
+        """
+        self._wait_until(lambda: self._in_flight < self.window, timeout)
+        future = self._track(msg_dict, Future())
+        try:
+            self.parser.transfer_to(msg_dict, self.stream)
+        except BaseException:
+            self._untrack(msg_dict, future)
+            raise
+        return future
+
+    def send_many(self, msg_dicts: Iterable[dict], timeout: Optional[float] = None) -> List[Future]:
+        """Send commands and return the futures of their replies.
+
+        The commands are written a window at a time with `Parser.transfer_many`, the timeout applies to each
+        wait for a place in the window.
+        """
+        futures = []
+        batch = []
+        for msg_dict in msg_dicts:
+            if self._in_flight + len(batch) >= self.window:
+                futures.extend(self._send_batch(batch))
+                batch = []
+                self._wait_until(lambda: self._in_flight < self.window, timeout)
+            batch.append(msg_dict)
+        futures.extend(self._send_batch(batch))
+        return futures
+
+    def wait(self, futures: Optional[Iterable[Future]] = None, timeout: Optional[float] = None):
+        """Read the stream until the given futures, or every command sent, are resolved.
+
+        Raise TimeoutError if this takes more than timeout seconds.
+        """
+        if futures is None:
+            self._wait_until(lambda: self._in_flight == 0, timeout)
+        else:
+            futures = list(futures)
+            self._wait_until(lambda: all(future.done() for future in futures), timeout)
+
+    def pump(self) -> int:
+        """Read once from the stream and handle the frames received, return the number of bytes read.
+
+        Streams with `in_waiting` are read by the number of bytes waiting, at least one, other streams up to
+        the read size of the parser. Buffered streams, eg. socket files, are read with `read1` so that the bytes
+        available are handled without waiting for more.
+        """
+        waiting = getattr(self.stream, 'in_waiting', None)
+        if waiting is None:
+            # noinspection PyProtectedMember
+            data = Parser._read_available(self.stream, self.parser._read_size)
+        else:
+            data = self.stream.read(max(waiting, 1))
+        if data:
+            self._handle(data)
+        return len(data)
+
+    def _send_batch(self, batch: List[dict]) -> List[Future]:
+        futures = []
+        try:
+            for msg_dict in batch:
+                futures.append(self._track(msg_dict, Future()))
+            if batch:
+                self.parser.transfer_many(batch, self.stream)
+        except BaseException:
+            for msg_dict, future in zip(batch, futures):
+                self._untrack(msg_dict, future)
+            raise
+        return futures
+
+    def _wait_until(self, condition: Callable[[], bool], timeout: Optional[float]):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not condition():
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("No reply was received within {} seconds".format(timeout))
+            if not self.pump() and deadline is None and not hasattr(self.stream, 'timeout'):
+                # A stream without a timeout, eg. a file, will not receive anything more
+                raise IOError("A stream read returned 0 bytes while waiting for a reply")
+
+
+class AsyncCommander(_CommanderBase):
+    """The asyncio version of `Commander` for a StreamReader and StreamWriter pair.
+
+    The replies are read by `run`, which must be running while commands are sent, for example as a task.
+    It returns at the end of the stream after failing the futures of the commands still waiting with an
+    IOError. The futures are asyncio futures resolving to True if the command is acknowledged and to False
+    if it is rejected.
+    """
+
+    def __init__(self, parser: Parser, reader, writer, window: int = 8,
+                 on_message: Optional[Callable[[str, str, Any], Any]] = None,
+                 on_error: Optional[Callable[[ValueError], Any]] = None):
+        super().__init__(parser, window, on_message, on_error)
+        self.reader = reader
+        self.writer = writer
+        self._slots = asyncio.Semaphore(window)
+
+    async def send(self, msg_dict: dict) -> asyncio.Future:
+        """Send a command once there is a place in the window and return the future of its reply."""
+        future = await self._acquire_and_track(msg_dict)
+        try:
+            await self.parser.transfer_to_async(msg_dict, self.writer)
+        except BaseException:
+            self._untrack(msg_dict, future)
+            raise
+        return future
+
+    async def send_many(self, msg_dicts: Iterable[dict]) -> List[asyncio.Future]:
+        """Send commands, a window at a time, and return the futures of their replies."""
+        futures = []
+        # The commands tracked but not sent yet, and their futures
+        batch = []
+        batch_futures = []
+        try:
+            for msg_dict in msg_dicts:
+                batch_futures.append(await self._acquire_and_track(msg_dict))
+                batch.append(msg_dict)
+                if self._slots.locked():
+                    # The window is full, send what is waiting before waiting for a reply
+                    await self.parser.transfer_many_async(batch, self.writer)
+                    futures.extend(batch_futures)
+                    batch, batch_futures = [], []
+            if batch:
+                await self.parser.transfer_many_async(batch, self.writer)
+                futures.extend(batch_futures)
+        except BaseException:
+            for msg_dict, future in zip(batch, batch_futures):
+                self._untrack(msg_dict, future)
+            raise
+        return futures
+
+    async def run(self):
+        """Read the replies and the other messages until the end of the stream."""
+        try:
+            while True:
+                # noinspection PyProtectedMember
+                data = await self.reader.read(self.parser._read_size)
+                if not data:
+                    break
+                self._handle(data)
+        finally:
+            self._fail_all(IOError("The stream ended before the reply was received"))
+
+    async def _acquire_and_track(self, msg_dict: dict) -> asyncio.Future:
+        """Wait for a place in the window and track the command, the place is released if it is invalid."""
+        await self._slots.acquire()
+        try:
+            return self._track(msg_dict, asyncio.get_running_loop().create_future())
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _resolved(self):
+        self._slots.release()
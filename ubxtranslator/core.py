@@ -1,10 +1,70 @@
 """The core structure definitions"""
 
+import mmap
 import struct
+from array import array
 from collections import namedtuple
-from typing import List, Iterator, Union, Tuple, Any
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Iterator, AsyncIterator, Iterable, Union, Tuple, Any, Callable, Optional, TYPE_CHECKING
 
-__all__ = ['PadByte', 'Field', 'Flag', 'BitField', 'RepeatedBlock', 'Message', 'Cls', 'Parser']
+if TYPE_CHECKING:
+    import numpy
+
+__all__ = ['PadByte', 'Field', 'Flag', 'BitField', 'RepeatedBlock', 'Message', 'LazyPayload', 'Cls', 'Parser']
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Return the NumPy module, or None if it is not installed.
+
+    NumPy is an optional dependency that takes longer to import than the whole package, so it is only imported
+    the first time it is needed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# NumPy types of the struct format chars, used for structured arrays
+_DTYPES = {'B': '<u1', 'b': '<i1', 'H': '<u2', 'h': '<i2', 'I': '<u4', 'i': '<i4', 'f': '<f4', 'd': '<f8', 'c': 'S1'}
+
+
+class _PayloadTypes:
+    """Holds the named tuple types of the payloads as attributes so that payloads can be pickled by reference.
+
+    A type that has not been created yet is created from its attribute name, so a payload can be unpickled in a
+    process that has not decoded that message itself.
+    """
+
+    def __getattr__(self, key: str) -> type:
+        if key.startswith('__'):
+            raise AttributeError(key)
+        name, *field_names = key.split(' ')
+        return _payload_nt(name, field_names)
+
+
+_payload_types = _PayloadTypes()
+
+
+def _payload_nt(name: str, field_names: List[str]) -> type:
+    """Return the named tuple type of a payload, shared by every definition with the same name and fields.
+
+    The type is an attribute of `_payload_types` named after its name and fields, so it can be found when a
+    payload is unpickled in any process where the same definition has been created.
+    """
+    # Spaces cannot appear within the names, so the key is unique, and dots must not as they separate qualnames
+    key = ' '.join([name] + field_names)
+    nt = _payload_types.__dict__.get(key)
+    if nt is None:
+        nt = namedtuple(name, field_names)
+        nt.__module__ = __name__
+        nt.__qualname__ = '_payload_types.' + key
+        # setdefault is atomic, if another thread created the type first its type is used
+        nt = _payload_types.__dict__.setdefault(key, nt)
+    return nt
 
 
 
@@ -142,7 +202,7 @@ class BitField:
 
     """
 
-    __slots__ = ['name', '_type', '_subfields', '_nt', ]
+    __slots__ = ['name', '_type', '_subfields', '_nt_type', ]
     __types__ = {'X1': 'B', 'X2': 'H', 'X4': 'I'}
 
     # noinspection PyProtectedMember
@@ -168,7 +228,18 @@ class BitField:
                     sf.__class__.__name__, sf._stop, width
                 ))
 
-        self._nt = namedtuple(self.name, [f.name for f in self._subfields])
+        self._nt_type = None
+
+    @property
+    def _nt(self) -> type:
+        """The named tuple type of the flags, created on first use."""
+        if self._nt_type is None:
+            self._nt_type = _payload_nt(self.name, [f.name for f in self._subfields])
+        return self._nt_type
+
+    def __reduce__(self):
+        # The named tuple type is created by the constructor in the process unpickling the field
+        return BitField, (self.name, self._type, self._subfields)
 
     @property
     def repeated_block(self) -> bool:
@@ -199,14 +270,30 @@ class BitField:
 class RepeatedBlock:
     """Defines a repeated block of Fields within a UBX Message
 
+    The number of repeats is passed to `parse` for each payload rather than stored on the block, so one
+    definition can be used to decode from several threads at once. The `repeat` attribute is only used
+    by the `fmt` property and by `parse` when no repeat is passed.
     """
-    __slots__ = ['name', '_fields', 'repeat', '_nt', ]
+    __slots__ = ['name', '_fields', 'repeat', '_nt_type', '_fmt', '_struct', ]
 
     def __init__(self, name: str, fields: List[Union[Field, BitField, PadByte]]):
         self.name = name
         self._fields = fields
         self.repeat = 0
-        self._nt = namedtuple(self.name, [f.name for f in self._fields if hasattr(f, 'name')])
+        self._nt_type = None
+        self._fmt = ''.join([field.fmt for field in self._fields])
+        self._struct = struct.Struct('<' + self._fmt)
+
+    def __reduce__(self):
+        # The compiled struct cannot be pickled and the named tuple type may not exist yet where it is unpickled
+        return RepeatedBlock, (self.name, self._fields)
+
+    @property
+    def _nt(self) -> type:
+        """The named tuple type of the blocks, created on first use."""
+        if self._nt_type is None:
+            self._nt_type = _payload_nt(self.name, [f.name for f in self._fields if hasattr(f, 'name')])
+        return self._nt_type
 
     @property
     def repeated_block(self) -> bool:
@@ -214,17 +301,44 @@ class RepeatedBlock:
 
     @property
     def fmt(self) -> str:
-        """Return the format string for use with the struct package."""
-        return ''.join([field.fmt for field in self._fields]) * (self.repeat + 1)
+        """Return the little endian format string for use with the struct package."""
+        return '<' + self._fmt * (self.repeat + 1)
 
-    def parse(self, it: Iterator) -> Tuple[str, Any]:
+    def parse(self, it: Iterator, repeat: Optional[int] = None) -> Tuple[str, Any]:
         """Return a tuple representing the provided value/s"""
+        if repeat is None:
+            repeat = self.repeat
+
         resp = []
-        for i in range(self.repeat + 1):
+        for i in range(repeat + 1):
             resp.append(self._nt(**{k: v for k, v in [f.parse(it) for f in self._fields] if k is not None}))
 
         return self.name, resp
 
+    def parse_columns(self, payload: bytes) -> Any:
+        """Return a named tuple of columns parsed from the blocks within payload.
+
+        Each field is returned as an array.array of the values from all of the blocks, bit fields are
+        returned as named tuples of arrays with one array per flag. Char fields are returned as lists.
+        """
+        columns = iter(zip(*self._struct.iter_unpack(payload)))
+        values = []
+        for f in self._fields:
+            if isinstance(f, PadByte):
+                continue
+
+            column = next(columns)
+            if isinstance(f, BitField):
+                values.append(f._nt(*[
+                    array(f.fmt, [(v & sf._mask) >> sf._start for v in column]) for sf in f._subfields
+                ]))
+            elif f.fmt == 'c':
+                values.append(list(column))
+            else:
+                values.append(array(f.fmt, column))
+
+        return self._nt(*values)
+
     def pack(self, values: List[Any]) -> List[Any]:
         """Flatten values of repeated block items into a list for struct.pack"""
         res = []
@@ -263,8 +377,14 @@ class Message:
     The id is only allowed to be one byte wide so 0x00 <= id_ <= 0xFF values outside this range
     will raise a ValueError
 
+    The fields are compiled into `struct.Struct` instances when the message is constructed. Messages
+    with a repeated block have a separate struct for the fields before the block, the block itself and
+    the fields after the block. All of the structs are little endian without alignment, as per the
+    UBX protocol.
+
     """
-    __slots__ = ['_id', 'name', '_fields', '_nt', '_repeated_block', ]
+    __slots__ = ['_id', 'name', '_fields', '_nt_type', '_repeated_block', '_head_fmt', '_tail_fmt', '_head', '_tail',
+                 '_fixed_size', '_block_size', '_decoder', '_encoder', '_lazy', ]
 
     def __init__(self, id_: int, name: str, fields: list):
         if id_ < 0:
@@ -276,14 +396,43 @@ class Message:
         self._id = id_
         self.name = name
         self._fields = fields
-        self._nt = namedtuple(self.name, [f.name for f in self._fields if hasattr(f, 'name')])
+        # Creating a named tuple type is the slowest part of the definition, so it is left until first use
+        self._nt_type = None
         self._repeated_block = None
 
-        for field in fields:
+        head, tail = fields, []
+        for i, field in enumerate(fields):
             if field.repeated_block:
                 if self._repeated_block is not None:
                     raise ValueError('Cannot assign multiple repeated blocks to a message.')
                 self._repeated_block = field
+                head, tail = fields[:i], fields[i + 1:]
+
+        self._head_fmt = ''.join([field.fmt for field in head])
+        self._tail_fmt = ''.join([field.fmt for field in tail])
+        self._head = struct.Struct('<' + self._head_fmt)
+        self._tail = struct.Struct('<' + self._tail_fmt)
+        self._fixed_size = self._head.size + self._tail.size
+        self._block_size = self._repeated_block._struct.size if self._repeated_block is not None else 0
+        self._decoder = None
+        self._encoder = None
+        self._lazy = None
+
+    def __reduce__(self):
+        # The compiled structs and decoder cannot be pickled, so the message is rebuilt from its definition
+        return Message._unpickle, (self._id, self.name, self._fields, self._decoder is not None)
+
+    @property
+    def _nt(self) -> type:
+        """The named tuple type of the payload, created on first use."""
+        if self._nt_type is None:
+            self._nt_type = _payload_nt(self.name, [f.name for f in self._fields if hasattr(f, 'name')])
+        return self._nt_type
+
+    @staticmethod
+    def _unpickle(id_: int, name: str, fields: list, compiled: bool) -> 'Message':
+        msg = Message(id_, name, fields)
+        return msg.compile() if compiled else msg
 
     @property
     def id_(self) -> int:
@@ -292,8 +441,166 @@ class Message:
 
     @property
     def fmt(self) -> str:
-        """Return the format string for use with the struct package."""
-        return ''.join([field.fmt for field in self._fields])
+        """Return the format string for use with the struct package.
+
+        For messages with a repeated block the number of blocks is taken from its `repeat` attribute.
+        """
+        if self._repeated_block is None:
+            return '<' + self._head_fmt
+        return '<' + self._head_fmt + self._repeated_block._fmt * (self._repeated_block.repeat + 1) + self._tail_fmt
+
+    def compile(self) -> 'Message':
+        """Generate decoder and encoder functions specialised for this message and use them for parsing and packing.
+
+        The generated decoder unpacks the payload with the compiled structs, masks the bit field flags
+        inline and builds the named tuples positionally. The generated encoder reads each value and packs it
+        straight into the output buffer, see `pack_into`. The results are identical to the generic parse and
+        pack but several times faster. Return the message so that this can be chained with the constructor.
+        """
+        namespace = {'_nt': self._nt, '_head': self._head, '_tail': self._tail}
+        lines = ['def decode(payload, repeat):']
+
+        def values(fields, prefix):
+            """Return the names the values of the fields are unpacked to and the expressions building them."""
+            names, exprs = [], []
+            for field in fields:
+                if isinstance(field, PadByte):
+                    continue
+                name = '{}{}'.format(prefix, len(names))
+                names.append(name)
+                if isinstance(field, BitField):
+                    nt = '_nt{}'.format(len(namespace))
+                    namespace[nt] = field._nt
+                    exprs.append('{}({})'.format(nt, ', '.join(
+                        '({} & {}) >> {}'.format(name, sf._mask, sf._start) for sf in field._subfields
+                    )))
+                else:
+                    exprs.append(name)
+            return names, exprs
+
+        def has_bitfield(fields):
+            return any(isinstance(f, BitField) for f in fields)
+
+        rb = self._repeated_block
+        if rb is None:
+            if not has_bitfield(self._fields):
+                lines.append('    return _nt._make(_head.unpack(payload))')
+            else:
+                names, exprs = values(self._fields, 'v')
+                lines.append('    {}, = _head.unpack(payload)'.format(', '.join(names)))
+                lines.append('    return _nt({})'.format(', '.join(exprs)))
+        else:
+            index = self._fields.index(rb)
+            namespace['_block'] = rb._struct
+            namespace['_rb_nt'] = rb._nt
+
+            head_names, head_exprs = values(self._fields[:index], 'h')
+            if head_names:
+                lines.append('    {}, = _head.unpack_from(payload, 0)'.format(', '.join(head_names)))
+
+            lines.append('    stop = {} + ((repeat + 1) * {})'.format(self._head.size, self._block_size))
+            blocks = '_block.iter_unpack(payload[{}:stop])'.format(self._head.size)
+            if not has_bitfield(rb._fields):
+                lines.append('    rb = list(map(_rb_nt._make, {}))'.format(blocks))
+            else:
+                names, exprs = values(rb._fields, 'b')
+                lines.append('    rb = [_rb_nt({}) for ({},) in {}]'.format(', '.join(exprs), ', '.join(names), blocks))
+
+            tail_names, tail_exprs = values(self._fields[index + 1:], 't')
+            if tail_names:
+                lines.append('    {}, = _tail.unpack_from(payload, stop)'.format(', '.join(tail_names)))
+
+            lines.append('    return _nt({})'.format(', '.join(head_exprs + ['rb'] + tail_exprs)))
+
+        exec('\n'.join(lines), namespace)
+        self._decoder = namespace['decode']
+        self._encoder = self._compile_encoder()
+        return self
+
+    def _compile_encoder(self) -> Callable[[Any, bytearray, int], int]:
+        """Return a generated function packing the values of this message into a buffer, see `compile`.
+
+        The function takes the values, the buffer and the offset to pack the payload at and returns the length
+        of the payload. Missing values are packed as zero the same way as the generic `pack`.
+        """
+        namespace = {'_head': self._head, '_tail': self._tail}
+        lines = ['def encode(values, buff, offset):']
+
+        def reads(fields, container, prefix, required):
+            """Return the names the values of the fields are read to and the lines reading them from dicts and
+            from objects. Objects must have the fields if required, as for the top level of the generic pack.
+            """
+            names, from_dict, from_attr = [], [], []
+            for field in fields:
+                if isinstance(field, PadByte) or field.repeated_block:
+                    continue
+                name = '{}{}'.format(prefix, len(names))
+                names.append(name)
+
+                getters = ['{}.get({!r})'.format(container, field.name),
+                           'getattr({}, {!r}{})'.format(container, field.name, '' if required else ', None')]
+                for lines_, getter in zip((from_dict, from_attr), getters):
+                    lines_.append('{} = {}'.format(name, getter))
+                    lines_.append('if {} is None:'.format(name))
+                    if isinstance(field, BitField):
+                        lines_.append('    {} = 0'.format(name))
+                        lines_.append('elif isinstance({}, dict):'.format(name))
+                        lines_.append('    {} = {}'.format(name, ' | '.join(
+                            '(({}.get({!r}, 0) << {}) & {})'.format(name, sf.name, sf._start, sf._mask)
+                            for sf in field._subfields) or '0'))
+                        lines_.append('else:')
+                        lines_.append('    {} = {}'.format(name, ' | '.join(
+                            '((getattr({}, {!r}, 0) << {}) & {})'.format(name, sf.name, sf._start, sf._mask)
+                            for sf in field._subfields) or '0'))
+                    else:
+                        lines_.append('    {} = {!r}'.format(name, 0 if field._type != 'C' else b'\x00'))
+            return names, from_dict, from_attr
+
+        def branch(container, from_dict, from_attr, indent):
+            """Return the lines reading the values from the container whether it is a dict or an object."""
+            if not from_dict:
+                return []
+            pad = ' ' * indent
+            return ([pad + 'if isinstance({}, dict):'.format(container)] +
+                    [pad + '    ' + line for line in from_dict] +
+                    [pad + 'else:'] +
+                    [pad + '    ' + line for line in from_attr])
+
+        def pack_into(struct_name, names, pos, indent):
+            return [' ' * indent + '{}.pack_into(buff, {}{})'.format(struct_name, pos, ''.join(
+                ', ' + name for name in names))]
+
+        rb = self._repeated_block
+        if rb is None:
+            names, from_dict, from_attr = reads(self._fields, 'values', 'v', True)
+            lines.extend(branch('values', from_dict, from_attr, 4))
+            lines.extend(pack_into('_head', names, 'offset', 4))
+            lines.append('    return {}'.format(self._head.size))
+        else:
+            index = self._fields.index(rb)
+            namespace['_block'] = rb._struct
+
+            head_names, head_dict, head_attr = reads(self._fields[:index], 'values', 'h', True)
+            tail_names, tail_dict, tail_attr = reads(self._fields[index + 1:], 'values', 't', True)
+            lines.extend(branch('values', head_dict + tail_dict + ['rb = values.get({!r})'.format(rb.name)],
+                                head_attr + tail_attr + ['rb = getattr(values, {!r}, None)'.format(rb.name)], 4))
+            lines.append('    if not rb:')
+            lines.append('        raise ValueError("Repeated block {} cannot be empty")'.format(rb.name))
+
+            if head_names:
+                lines.extend(pack_into('_head', head_names, 'offset', 4))
+            lines.append('    pos = offset + {}'.format(self._head.size))
+            lines.append('    for item in rb:')
+            names, from_dict, from_attr = reads(rb._fields, 'item', 'b', False)
+            lines.extend(branch('item', from_dict, from_attr, 8))
+            lines.extend(pack_into('_block', names, 'pos', 8))
+            lines.append('        pos += {}'.format(self._block_size))
+            if tail_names:
+                lines.extend(pack_into('_tail', tail_names, 'pos', 4))
+            lines.append('    return pos + {} - offset'.format(self._tail.size))
+
+        exec('\n'.join(lines), namespace)
+        return namespace['encode']
 
     def parse(self, payload: bytes) -> Tuple[str, Any]:
         """Return a named tuple parsed from the provided payload.
@@ -302,14 +609,172 @@ class Message:
         then a ValueError is raised.
         """
 
-        self.check_payload_length(len(payload))
+        repeat = self.check_payload_length(len(payload))
+
+        if self._decoder is not None:
+            return self.name, self._decoder(payload, repeat)
+
+        if self._repeated_block is None:
+            it = iter(self._head.unpack(payload))
+        else:
+            block = self._repeated_block._struct
+            offset = self._head.size
+            values = list(self._head.unpack_from(payload))
+            for _ in range(repeat + 1):
+                values.extend(block.unpack_from(payload, offset))
+                offset += block.size
+            values.extend(self._tail.unpack_from(payload, offset))
+            it = iter(values)
+
+        return self.name, self._nt(**{k: v for k, v in [
+            f.parse(it, repeat) if f.repeated_block else f.parse(it) for f in self._fields
+        ] if k is not None})
+
+    def parse_lazy(self, payload: bytes) -> Tuple[str, 'LazyPayload']:
+        """Return a lazy payload for the provided payload, the fields are only decoded when accessed.
+
+        The payload length is checked straight away, see `LazyPayload` for the rest.
+        """
+        repeat = self.check_payload_length(len(payload))
+        if self._lazy is None:
+            self._lazy = LazyPayload._subclass(self)
+        return self.name, self._lazy(bytes(payload), repeat)
+
+    def parse_columns(self, payload: bytes) -> Tuple[str, Any]:
+        """Return a named tuple parsed from the provided payload with the repeated block as columns.
+
+        The repeated block is returned by `RepeatedBlock.parse_columns` rather than as a list of named
+        tuples, the rest of the message is the same as `parse`.
+        """
+        rb = self._repeated_block
+        if rb is None:
+            return self.parse(payload)
+
+        repeat = self.check_payload_length(len(payload))
+        stop = self._head.size + ((repeat + 1) * self._block_size)
 
-        it = iter(struct.unpack(self.fmt, payload))
+        kwargs = {}
+        it = iter(self._head.unpack_from(payload, 0))
+        for f in self._fields:
+            if f is rb:
+                kwargs[f.name] = rb.parse_columns(payload[self._head.size:stop])
+                it = iter(self._tail.unpack_from(payload, stop))
+            else:
+                k, v = f.parse(it)
+                if k is not None:
+                    kwargs[k] = v
 
-        return self.name, self._nt(**{k: v for k, v in [f.parse(it) for f in self._fields] if k is not None})
+        return self.name, self._nt(**kwargs)
+
+    def dtype(self) -> 'numpy.dtype':
+        """Return a NumPy structured dtype matching the layout of the message payload.
+
+        Bit fields are included as unsigned integers of their width, pad bytes are left out but kept in
+        the offsets. For messages with a repeated block the dtype is the layout of one row, ie. the fields
+        before the block, one block and the fields after it, as `parse_array` returns one row per block.
+        A ValueError is raised if the names of the block fields clash with the other fields. NumPy is an
+        optional dependency, ImportError is raised if it is not installed.
+        """
+        if _numpy() is None:
+            raise ImportError("NumPy is required for structured arrays, install ubxtranslator[numpy]")
+
+        return self._raw_dtype(self._row_fields())
+
+    def parse_array(self, payloads) -> 'numpy.ndarray':
+        """Return a NumPy structured array parsed from the payloads of many messages.
+
+        For messages without a repeated block the payloads are concatenated, and viewed with a single
+        `numpy.frombuffer` call. For messages with a repeated block they must be a list of payloads, as their
+        lengths vary, and each block becomes a row with the fields before and after the block repeated on
+        every row. Bit fields are then expanded into nested fields with one field per flag, eg.
+        `arr['flags']['gnssFixOK']`. See `dtype` for the errors raised.
+        """
+        self.dtype()
+        numpy = _numpy()
+        rb = self._repeated_block
+        if rb is None:
+            if not isinstance(payloads, (bytes, bytearray, memoryview)):
+                payloads = b''.join(payloads)
+            raw_dtype = self._raw_dtype(self._fields)
+            if len(payloads) % raw_dtype.itemsize:
+                raise ValueError('The payloads length is not a multiple of the message length. ' +
+                                 'Expected n * {} actual {}'.format(raw_dtype.itemsize, len(payloads)))
+            raw = numpy.frombuffer(payloads, dtype=raw_dtype)
+            return self._expand_array(len(raw), [(self._fields, raw)])
+
+        if isinstance(payloads, (bytes, bytearray, memoryview)):
+            raise ValueError("Message {} has a repeated block, its payloads must be given as a list".format(self.name))
+
+        # The fields around the block are gathered together and repeated for each block of their message
+        fixed_fields = [f for f in self._fields if f is not rb]
+        fixed, blocks, counts = [], [], []
+        for payload in payloads:
+            counts.append(self.check_payload_length(len(payload)) + 1)
+            tail_start = len(payload) - self._tail.size
+            fixed.append(payload[:self._head.size])
+            fixed.append(payload[tail_start:])
+            blocks.append(payload[self._head.size:tail_start])
+
+        block_raw = numpy.frombuffer(b''.join(blocks), dtype=self._raw_dtype(rb._fields))
+        sources = [(rb._fields, block_raw)]
+        # NumPy cannot view a buffer with a dtype of no size, ie. when the block is the whole message
+        if self._fixed_size:
+            fixed_raw = numpy.repeat(numpy.frombuffer(b''.join(fixed), dtype=self._raw_dtype(fixed_fields)), counts)
+            sources.append((fixed_fields, fixed_raw))
+        return self._expand_array(len(block_raw), sources)
+
+    def _row_fields(self) -> list:
+        """Return the fields of one row of a structured array, with the repeated block flattened."""
+        rb = self._repeated_block
+        if rb is None:
+            return self._fields
+        fields = []
+        for f in self._fields:
+            fields.extend(rb._fields if f is rb else [f])
+        return fields
+
+    @staticmethod
+    def _raw_dtype(fields: list) -> 'numpy.dtype':
+        """Return the structured dtype of fields packed back to back, bit fields are left as integers."""
+        names, formats, offsets = [], [], []
+        offset = 0
+        for f in fields:
+            if not isinstance(f, PadByte):
+                names.append(f.name)
+                formats.append(_DTYPES[f.fmt])
+                offsets.append(offset)
+            offset += struct.calcsize('<' + f.fmt)
+
+        return _numpy().dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': offset})
+
+    def _expand_array(self, length: int, sources: list) -> 'numpy.ndarray':
+        """Return a structured array of length rows filled from (fields, raw array) pairs, expanding bit fields."""
+        formats = []
+        for f in self._row_fields():
+            if isinstance(f, BitField):
+                formats.append((f.name, [(sf.name, _DTYPES[f.fmt]) for sf in f._subfields]))
+            elif isinstance(f, Field):
+                formats.append((f.name, _DTYPES[f.fmt]))
+
+        arr = _numpy().empty(length, dtype=formats)
+        for fields, raw in sources:
+            for f in fields:
+                if isinstance(f, BitField):
+                    values = raw[f.name]
+                    for sf in f._subfields:
+                        arr[f.name][sf.name] = (values & sf._mask) >> sf._start
+                elif isinstance(f, Field):
+                    arr[f.name] = raw[f.name]
+
+        return arr
 
     def pack(self, values: Any) -> bytes:
         """Return the bytes of the payload for this message from provided values."""
+        if self._encoder is not None:
+            payload = bytearray(self.payload_length(values))
+            self._encoder(values, payload, 0)
+            return bytes(payload)
+
         flat_values = []
         if self._repeated_block:
             if isinstance(values, dict):
@@ -318,7 +783,6 @@ class Message:
                 repeated_list = getattr(values, self._repeated_block.name, [])
             if not repeated_list:
                 raise ValueError("Repeated block {} cannot be empty".format(self._repeated_block.name))
-            self._repeated_block.repeat = len(repeated_list) - 1
 
         for f in self._fields:
             if isinstance(f, (BitField, RepeatedBlock)):
@@ -329,7 +793,9 @@ class Message:
                 if isinstance(f, BitField):
                     flat_values.append(f.pack(val if val is not None else {}))
                 else:
+                    head_end = len(flat_values)
                     flat_values.extend(f.pack(val if val is not None else []))
+                    block_end = len(flat_values)
             elif isinstance(f, Field):
                 if isinstance(values, dict):
                     val = values.get(f.name)
@@ -340,37 +806,183 @@ class Message:
                 pass
             # PadByte doesn't take values
 
-        return struct.pack(self.fmt, *flat_values)
+        if self._repeated_block is None:
+            return self._head.pack(*flat_values)
+
+        block = self._repeated_block._struct
+        count = (block_end - head_end) // len(repeated_list)
+        payload = bytearray(self._head.size + (block.size * len(repeated_list)) + self._tail.size)
+
+        self._head.pack_into(payload, 0, *flat_values[:head_end])
+        offset = self._head.size
+        for i in range(head_end, block_end, count or 1):
+            block.pack_into(payload, offset, *flat_values[i:i + count])
+            offset += block.size
+        self._tail.pack_into(payload, offset, *flat_values[block_end:])
+
+        return bytes(payload)
+
+    def payload_length(self, values: Any) -> int:
+        """Return the length of the payload packed from the provided values."""
+        if self._repeated_block is None:
+            return self._fixed_size
+
+        if isinstance(values, dict):
+            repeated_list = values.get(self._repeated_block.name)
+        else:
+            repeated_list = getattr(values, self._repeated_block.name, None)
+        if not repeated_list:
+            raise ValueError("Repeated block {} cannot be empty".format(self._repeated_block.name))
+        return self._fixed_size + self._block_size * len(repeated_list)
+
+    def pack_into(self, values: Any, buff: bytearray, offset: int = 0) -> int:
+        """Pack the payload for this message from provided values into buff at offset and return its length.
+
+        A bytearray is extended if it is too short, other writable buffers must be long enough. Once the
+        message is compiled the values are packed straight into the buffer, so a buffer can be reused to
+        pack many messages without creating any intermediate bytes.
+        """
+        length = self._reserve(buff, offset + self.payload_length(values)) - offset
+
+        if self._encoder is not None:
+            self._encoder(values, buff, offset)
+        else:
+            buff[offset:offset + length] = self.pack(values)
+        return length
+
+    @staticmethod
+    def _reserve(buff: bytearray, size: int) -> int:
+        """Extend a bytearray to at least size bytes, raise ValueError if another buffer is shorter. Return size."""
+        if len(buff) < size:
+            if not isinstance(buff, bytearray):
+                raise ValueError("The buffer of {} bytes is too short, {} bytes are needed".format(len(buff), size))
+            buff.extend(bytes(size - len(buff)))
+        return size
+
+    def length_range(self, max_length: int = 0xFFFF) -> Tuple[int, int, int]:
+        """Return the (shortest, longest, step) payload lengths of this message up to max_length.
+
+        The step is the size of the repeated block, zero if the message has a fixed length. The longest length
+        is less than the shortest if the message cannot fit within max_length.
+        """
+        if self._repeated_block is None:
+            longest = self._fixed_size if self._fixed_size <= max_length else -1
+            return self._fixed_size, longest, 0
+
+        shortest = self._fixed_size + self._block_size
+        if shortest > max_length:
+            return shortest, -1, self._block_size
+        return shortest, max_length - (max_length - shortest) % self._block_size, self._block_size
 
-    def check_payload_length(self, payload_len: int):
+    def check_payload_length(self, payload_len: int) -> int:
         """Check whether payload_len is a valid length for this type of message.
 
         Raises ValueError if the length is not valid.
 
-        self._repeated_block.repeat will be set appropriately after
-        returning (if relevant for this message type).
+        Return the number of times the repeated block is repeated, zero if the message does not have a
+        repeated block. The message itself is not modified, so this is safe to call from several threads.
         """
+        if self._repeated_block is None:
+            if payload_len != self._fixed_size:
+                raise ValueError('The payload length does not match the length implied by the message fields. ' +
+                                 'Expected {} actual {}'.format(self._fixed_size, payload_len))
+            return 0
 
-        try:
-            self._repeated_block.repeat = 0
-        except AttributeError:
-            pass
+        blocks, remainder = divmod(payload_len - self._fixed_size, self._block_size)
+        if blocks < 1 or remainder:
+            raise ValueError('The payload length does not match the length implied by the message fields. ' +
+                             'Expected {} + n * {} actual {}'.format(self._fixed_size, self._block_size, payload_len))
 
-        while True:
-            fmt_len = struct.calcsize(self.fmt)
+        return blocks - 1
 
-            if fmt_len == payload_len:
-                break
 
-            if fmt_len > payload_len:
-                raise ValueError('The payload length does not match the length implied by the message fields. ' +
-                                 'Expected {} actual {}'.format(struct.calcsize(self.fmt), payload_len))
+class LazyPayload:
+    """A message payload that decodes each field when it is accessed.
 
-            try:
-                self._repeated_block.repeat += 1
-            except AttributeError:
-                raise ValueError('The payload length does not match the length implied by the message fields. ' +
-                                 'Expected {} actual {}'.format(struct.calcsize(self.fmt), payload_len))
+    The raw payload is kept and each field is unpacked from its offset on access, so consumers reading a
+    few fields of a large message do not pay for decoding the rest. The attribute names are the same as the
+    named tuple returned by `Message.parse`, and `_fields` and `_asdict()` are supported. The values are
+    decoded on every access, assign them to a local if they are used repeatedly.
+
+    A subclass with a property per field is created for each message the first time it is parsed lazily.
+    """
+    __slots__ = ['_payload', '_repeat', ]
+    _fields = ()
+
+    def __init__(self, payload: bytes, repeat: int = 0):
+        self._payload = payload
+        self._repeat = repeat
+
+    def _asdict(self) -> dict:
+        """Return a dict of all of the decoded fields."""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self._fields
+        ))
+
+    @staticmethod
+    def _subclass(msg: Message) -> type:
+        """Return a subclass with a property decoding each field of the message."""
+        rb = msg._repeated_block
+        namespace = {'__slots__': [], '_fields': msg._nt._fields}
+
+        offset = 0
+        after_block = False
+        for f in msg._fields:
+            if f is rb:
+                namespace[f.name] = property(LazyPayload._block_getter(msg))
+                offset = 0
+                after_block = True
+                continue
+
+            if not isinstance(f, PadByte):
+                namespace[f.name] = property(LazyPayload._field_getter(msg, f, offset, after_block))
+            offset += struct.calcsize('<' + f.fmt)
+
+        return type(msg.name, (LazyPayload, ), namespace)
+
+    @staticmethod
+    def _field_getter(msg: Message, field: Union[Field, BitField], offset: int, after_block: bool):
+        """Return a function decoding the field at offset, after_block if the offset is after the repeated block."""
+        unpack_from = struct.Struct('<' + field.fmt).unpack_from
+        head_size = msg._head.size
+        block_size = msg._block_size
+
+        if isinstance(field, BitField):
+            nt = field._nt
+            subfields = [(sf._mask, sf._start) for sf in field._subfields]
+
+            def convert(value):
+                return nt(*[(value & mask) >> start for mask, start in subfields])
+        else:
+            def convert(value):
+                return value
+
+        if after_block:
+            def getter(self):
+                return convert(unpack_from(self._payload, head_size + ((self._repeat + 1) * block_size) + offset)[0])
+        else:
+            def getter(self):
+                return convert(unpack_from(self._payload, offset)[0])
+
+        return getter
+
+    @staticmethod
+    def _block_getter(msg: Message):
+        """Return a function decoding the repeated block of the message into a list of named tuples."""
+        rb = msg._repeated_block
+        head_size = msg._head.size
+
+        def getter(self):
+            stop = head_size + ((self._repeat + 1) * rb._struct.size)
+            values = []
+            for block in rb._struct.iter_unpack(self._payload[head_size:stop]):
+                values.extend(block)
+            return rb.parse(iter(values), self._repeat)[1]
+
+        return getter
 
 
 class Cls:
@@ -416,6 +1028,12 @@ class Cls:
                 item, self
             ))
 
+    def compile(self) -> 'Cls':
+        """Compile a specialised decoder for every registered message, see `Message.compile`."""
+        for msg in self._messages.values():
+            msg.compile()
+        return self
+
     def register_msg(self, msg: Message):
         """Register a message type."""
         # noinspection PyProtectedMember
@@ -451,20 +1069,73 @@ class Parser:
     examples file.
 
     The parser now also includes methods to pack messages into packets for two-way communications.
+
+    If `columnar` is set repeated blocks are decoded into columns, see `Message.parse_columns`. If `lazy` is set
+    the fields are only decoded when they are accessed, see `LazyPayload`.
+
+    If `resync` is set scanning resumes one byte after the prefix of an invalid frame rather than after the
+    frame, so a valid frame starting within the bytes of a corrupt one is not lost. `receive_from` then reads the
+    stream into the input buffer as in buffered mode, which provides the lookahead. Bytes are only rescanned
+    after an invalid frame and most false prefixes are rejected by the header checks, so the scan stays linear
+    in the number of bytes. `discarded_bytes` counts the bytes that were not part of a valid or skipped frame
+    and `bad_frames` counts the invalid frames, for every method but the unbuffered `receive_from` and
+    `receive_from_async` which read past the stream bytes without keeping them.
+
+    The length of every frame is checked against a table of the valid payload lengths of each registered message
+    straight after the header is read, so a corrupt header cannot make the parser wait for or buffer more than
+    the longest valid frame. `max_length` caps the length of messages with a repeated block and of frames
+    skipped by a subscription, see `subscribe`. The table is built when a class is registered with the parser.
+
+    If `buffered` is set the stream is read in chunks of up to `read_size` bytes into an internal buffer rather
+    than one byte at a time, the prefix is located with `bytearray.find` and whole frames are sliced out of the
+    buffer. Bytes read past the end of a frame are kept for the next call, so a buffered parser should only be
+    used with a single stream. Streams that provide `in_waiting`, such as pyserial ports, are read by the number
+    of bytes waiting, capped at `read_size`, but never less than the rest of the current frame. This way a read
+    does not block on a partially filled chunk and a slowly filling port is not read one byte at a time. Buffered
+    streams, such as the files of sockets, are read with `read1` so that a read returns the bytes available.
     """
     PREFIX = bytes((0xB5, 0x62))
-
-    def __init__(self, classes: List[Cls]):
-        self._input_buffer = b''
+    _HEADER = struct.Struct('<BBH')
+    # Payloads longer than this use the strided or NumPy checksum
+    _LARGE_CHECKSUM = 2048
+
+    def __init__(self, classes: List[Cls], buffered: bool = False, read_size: int = 4096, columnar: bool = False,
+                 lazy: bool = False, resync: bool = False, max_length: int = 0xFFFF):
+        if columnar and lazy:
+            raise ValueError("The columnar and lazy decode modes cannot be combined")
+
+        self._input_buffer = bytearray()
+        self._buffered = buffered
+        self._read_size = read_size
+        self._columnar = columnar
+        self._lazy = lazy
+        self._resync = resync
+        self._max_length = max_length
+
+        self.discarded_bytes = 0
+        self.bad_frames = 0
+
+        self._subscription = None
+        self._predicate = None
+        self._filtered = False
+        self._verify_skipped = False
 
         self.classes = {}
+        # (class id, message id): (message, shortest, longest, step) payload length
+        self._lengths = {}
         for cls in classes:
-            self.classes[cls._id] = cls
+            self.register_cls(cls)
 
     def register_cls(self, cls: Cls):
         """Register a message  class."""
         self.classes[cls.id_] = cls
 
+        for key in [key for key in self._lengths if key[0] == cls.id_]:
+            del self._lengths[key]
+        # noinspection PyProtectedMember
+        for msg in cls._messages.values():
+            self._lengths[(cls.id_, msg.id_)] = (msg,) + msg.length_range(self._max_length)
+
     def get_cls_by_name(self, name: str) -> Cls:
         """Find a registered class by name."""
         for cls in self.classes.values():
@@ -501,9 +1172,37 @@ class Parser:
         res['_msg_id'] = msg.id_
         return res
 
+    def pack_into(self, msg_dict: dict, buff: bytearray, offset: int = 0) -> int:
+        """Build a UBX packet from a message dictionary into buff at offset and return the length of the packet.
+
+        The prefix, header, payload and checksum are written in place, a bytearray is extended if it is too
+        short and other writable buffers must be long enough. With compiled messages, see `Message.compile`,
+        a buffer can be reused to build many packets without creating any intermediate bytes.
+        Raise ValueError in case of errors due to an invalid message dictionary.
+        """
+        cls_id, msg_id = self._msg_ids(msg_dict)
+        msg_obj = self.classes[cls_id][msg_id]
+
+        length = msg_obj.pack_into(msg_dict, buff, offset + 6)
+        stop = offset + 6 + length
+        Message._reserve(buff, stop + 2)
+
+        buff[offset:offset + 2] = self.PREFIX
+        self._HEADER.pack_into(buff, offset + 2, cls_id, msg_id, length)
+        # Slicing a bytearray copies the frame, but iterating the copy is faster than iterating a memoryview
+        buff[stop:stop + 2] = self._generate_fletcher_checksum(buff[offset + 2:stop])
+        return length + 8
+
     def _pack_for_transfer(self, msg_dict: dict) -> bytes:
         """Build a UBX packet from a message dictionary.
         Raise ValueError in case of errors due to an invalid message dictionary."""
+        packet = bytearray()
+        self.pack_into(msg_dict, packet)
+        return bytes(packet)
+
+    @staticmethod
+    def _msg_ids(msg_dict: dict) -> Tuple[int, int]:
+        """Return the class and message id of a message dictionary prepared by prepare_msg."""
         try:
             cls_id = msg_dict['_cls_id']
         except KeyError:
@@ -512,16 +1211,7 @@ class Parser:
             msg_id = msg_dict['_msg_id']
         except KeyError:
             raise ValueError("Message dictionary must contain a `_msg_id` key, did you forget to call prepare_msg?")
-
-        cls = self.classes[cls_id]
-        msg_obj = cls[msg_id]
-        payload = msg_obj.pack(msg_dict)
-
-        header = struct.pack('BBH', cls_id, msg_id, len(payload))
-        packet = self.PREFIX + header + payload
-        ck_a, ck_b = self._generate_fletcher_checksum(header + payload)
-        packet += struct.pack('BB', ck_a, ck_b)
-        return packet
+        return cls_id, msg_id
 
     def transfer_to(self, msg_dict: dict, stream):
         """Build and write a UBX packet to a stream from a message dictionary."""
@@ -537,35 +1227,98 @@ class Parser:
         if hasattr(stream, 'drain'):
             await stream.drain()
 
+    def transfer_many(self, msg_dicts: Iterable[dict], stream, max_chunk: Optional[int] = None) -> int:
+        """Build UBX packets from message dictionaries back to back and write them to a stream at once.
+
+        The packets are written with a single write and flush. If `max_chunk` is set the data is written in
+        chunks of up to that many bytes, each flushed, for receivers with a small input buffer. Chunks end on
+        packet boundaries and only packets longer than `max_chunk` are split. Return the number of bytes written.
+        """
+        chunks = self._pack_many(msg_dicts, max_chunk)
+        for chunk in chunks:
+            stream.write(chunk)
+            if hasattr(stream, 'flush'):
+                stream.flush()
+        return sum(len(chunk) for chunk in chunks)
+
+    async def transfer_many_async(self, msg_dicts: Iterable[dict], stream, max_chunk: Optional[int] = None) -> int:
+        """Async version of transfer_many, the stream is drained after each chunk."""
+        chunks = self._pack_many(msg_dicts, max_chunk)
+        for chunk in chunks:
+            stream.write(chunk)
+            if hasattr(stream, 'drain'):
+                await stream.drain()
+        return sum(len(chunk) for chunk in chunks)
+
+    def _pack_many(self, msg_dicts: Iterable[dict], max_chunk: Optional[int] = None) -> List[bytes]:
+        """Return the packets of the message dictionaries packed into chunks of up to max_chunk bytes."""
+        buff = bytearray()
+        # The offsets where the chunks may be split, ie. the end of each packet
+        ends = []
+        for msg_dict in msg_dicts:
+            ends.append(len(buff) + self.pack_into(msg_dict, buff, len(buff)))
+
+        if not max_chunk:
+            return [bytes(buff)] if buff else []
+
+        chunks = []
+        start = 0
+        prev = 0
+        for end in ends:
+            if end - start > max_chunk and prev > start:
+                chunks.append(bytes(buff[start:prev]))
+                start = prev
+            while end - start > max_chunk:
+                chunks.append(bytes(buff[start:start + max_chunk]))
+                start += max_chunk
+            prev = end
+        if prev > start:
+            chunks.append(bytes(buff[start:prev]))
+        return chunks
+
     def receive_from(self, stream) -> Tuple[str, str, Any]:
         """Receive a message from a stream and return as a namedtuple.
         Raise IOError in case of errors due to insufficient data.
         Raise ValueError in case of errors due to sufficient but invalid data.
         """
+        if self._buffered or self._resync:
+            return self._receive_buffered(stream)
+
         while True:
-            # Search for the prefix
-            buff = self._read_until(stream, terminator=self.PREFIX)
-            if buff[-2:] == self.PREFIX:
-                break
+            while True:
+                # Search for the prefix
+                buff = self._read_until(stream, terminator=self.PREFIX)
+                if buff[-2:] == self.PREFIX:
+                    break
 
-        # read the first four bytes
-        buff = stream.read(4)
+            # read the first four bytes
+            buff = stream.read(4)
 
-        if len(buff) != 4:
-            raise IOError("A stream read returned {} bytes, expected 4 bytes".format(len(buff)))
+            if len(buff) != 4:
+                raise IOError("A stream read returned {} bytes, expected 4 bytes".format(len(buff)))
 
-        # convert them into the packet descriptors
-        msg_cls, msg_id, length = struct.unpack('BBH', buff)
+            # convert them into the packet descriptors
+            msg_cls, msg_id, length = self._HEADER.unpack(buff)
 
-        # check the packet validity
-        if msg_cls not in self.classes:
-            raise ValueError("Received unsupported message class of {:x}".format(msg_cls))
+            if self._filtered and not self._subscribed(buff, 0, msg_cls, msg_id):
+                # Skip the rest of the frame without decoding it
+                err = self._skipped_length_error(msg_cls, msg_id, length)
+                if err is not None:
+                    raise err
+                rest = stream.read(length + 2)
+                if len(rest) != length + 2:
+                    raise IOError("A stream read returned {} bytes, expected {} bytes".format(
+                        len(rest), length + 2))
+                if self._verify_skipped:
+                    self._check_checksum(buff + rest[:-2], rest[-2:])
+                continue
 
-        if msg_id not in self.classes[msg_cls]:
-            raise ValueError("Received unsupported message id of {:x} in class {:x}".format(
-                msg_id, msg_cls))
+            break
 
-        self.classes[msg_cls][msg_id].check_payload_length(length)
+        # check the packet validity
+        err = self._length_error(msg_cls, msg_id, length)
+        if err is not None:
+            raise err
 
         # Read the payload
         buff += stream.read(length)
@@ -578,36 +1331,44 @@ class Parser:
         if len(checksum_sup) != 2:
             raise IOError("A stream read returned {} bytes, expected 2 bytes".format(len(checksum_sup)))
 
-        checksum_cal = self._generate_fletcher_checksum(buff)
-        if checksum_cal != checksum_sup:
-            raise ValueError("Checksum mismatch. Calculated {:x} {:x}, received {:x} {:x}".format(
-                checksum_cal[0], checksum_cal[1], checksum_sup[0], checksum_sup[1]
-            ))
+        self._check_checksum(buff, checksum_sup)
 
-        return self.classes[msg_cls].parse(msg_id, buff[4:])
+        return self._decode(msg_cls, msg_id, buff[4:])
 
     async def receive_from_async(self, stream) -> Tuple[str, str, Any]:
         """Async version of receive_from."""
         while True:
-            # Search for the prefix
-            buff = await self._read_until_async(stream, terminator=Parser.PREFIX)
-            if buff[-2:] == Parser.PREFIX:
-                break
+            while True:
+                # Search for the prefix
+                buff = await self._read_until_async(stream, terminator=Parser.PREFIX)
+                if buff[-2:] == Parser.PREFIX:
+                    break
 
-        # read the first four bytes
-        buff = await stream.readexactly(4)
+            # read the first four bytes
+            buff = await stream.readexactly(4)
 
-        if len(buff) != 4:
-            raise IOError("A stream read returned {} bytes, expected 4 bytes".format(len(buff)))
+            if len(buff) != 4:
+                raise IOError("A stream read returned {} bytes, expected 4 bytes".format(len(buff)))
 
-        # convert them into the packet descriptors
-        msg_cls, msg_id, length = struct.unpack("BBH", buff)
+            # convert them into the packet descriptors
+            msg_cls, msg_id, length = self._HEADER.unpack(buff)
 
-        # check the packet validity
-        if msg_cls not in self.classes:
-            raise ValueError("Received unsupported message class of {:x}".format(msg_cls))
-        if msg_id not in self.classes[msg_cls]:
-            raise ValueError("Received unsupported message id of {:x} in class {:x}".format(msg_id, msg_cls))
+            if self._filtered and not self._subscribed(buff, 0, msg_cls, msg_id):
+                # Skip the rest of the frame without decoding it
+                err = self._skipped_length_error(msg_cls, msg_id, length)
+                if err is not None:
+                    raise err
+                rest = await stream.readexactly(length + 2)
+                if self._verify_skipped:
+                    self._check_checksum(buff + rest[:-2], rest[-2:])
+                continue
+
+            break
+
+        # check the packet validity before waiting for the payload
+        err = self._length_error(msg_cls, msg_id, length)
+        if err is not None:
+            raise err
 
         # Read the payload
         payload = await stream.readexactly(length)
@@ -615,14 +1376,417 @@ class Parser:
 
         # Read the checksum
         checksum_sup = await stream.readexactly(2)
-        checksum_cal = self._generate_fletcher_checksum(full_msg_for_checksum)
+        self._check_checksum(full_msg_for_checksum, checksum_sup)
+
+        return self._decode(msg_cls, msg_id, payload)
+
+    async def stream(self, reader, batch: bool = False, on_error: Optional[Callable[[ValueError], Any]] = None
+                     ) -> AsyncIterator[Union[Tuple[str, str, Any], List[Tuple[str, str, Any]]]]:
+        """Yield the messages read from an asyncio StreamReader until the end of the stream.
+
+        The reader is read in chunks of up to `read_size` bytes which are decoded by `feed`, so there is a
+        single await per chunk rather than several per frame. If `batch` is set the list of messages decoded
+        from each chunk is yielded instead of each message, chunks without a complete message are not yielded.
+
+        Invalid frames are skipped and counted, resynchronising as configured on the parser, if provided
+        `on_error` is called with the ValueError describing each of them. A partial frame left at the end of
+        the stream is discarded and reported the same way.
+        """
+        while True:
+            chunk = await reader.read(self._read_size)
+            if not chunk:
+                break
+
+            msgs = self.feed(chunk, on_error)
+            if batch:
+                if msgs:
+                    yield msgs
+            else:
+                for msg in msgs:
+                    yield msg
+
+        buff = self._input_buffer
+        self.discarded_bytes += len(buff)
+        if len(buff) >= 2 and on_error is not None:
+            on_error(ValueError("Truncated frame of {} bytes at the end of the stream".format(len(buff))))
+        del buff[:]
+
+    def feed(self, data: bytes, on_error: Optional[Callable[[ValueError], Any]] = None) -> List[Tuple[str, str, Any]]:
+        """Add data to the input buffer and return a list of all the complete messages found.
+
+        This is the push style counterpart of `receive_from` for data sources that do not provide a `read`
+        method, the data can be split at any point. Partial frames are kept in the input buffer until the rest
+        of the frame is fed in. Invalid frames are skipped, if provided `on_error` is called with the
+        ValueError describing each of them.
+
+        The input buffer is shared with the buffered `receive_from`, so a ValueError is raised if the parser
+        was constructed with `buffered` set. Use a separate parser for each data source.
+        """
+        return [self._decode(msg_cls, msg_id, payload)
+                for msg_cls, msg_id, payload in self.feed_frames(data, on_error)]
+
+    def feed_frames(self, data: bytes, on_error: Optional[Callable[[ValueError], Any]] = None
+                    ) -> List[Tuple[int, int, bytearray]]:
+        """Same as `feed` but return the class id, message id and payload bytes of each frame without decoding."""
+        if self._buffered:
+            raise ValueError("Cannot feed a buffered parser, the input buffer belongs to receive_from")
+
+        buff = self._input_buffer
+        buff += data
+        end = len(buff)
+
+        frames = []
+        pos = 0
+        try:
+            while True:
+                start, stop, err = self._scan(buff, pos, end)
+                if stop is None:
+                    pos = start
+                    break
+
+                if err is not None:
+                    pos = self._skip_bad_frame(start, stop)
+                    if on_error is not None:
+                        on_error(err)
+                    continue
+
+                pos = stop
+
+                frames.append((buff[start + 2], buff[start + 3], buff[start + 6:stop - 2]))
+        finally:
+            # Deleting from the front of a bytearray does not copy the remaining bytes. This is done even if
+            # on_error raises so the frames already handled are not returned again.
+            del buff[:pos]
+
+        return frames
+
+    def decode_bytes(self, buff, on_error: Optional[Callable[[ValueError], Any]] = None
+                     ) -> Iterator[Tuple[str, str, Any]]:
+        """Yield every message within a complete buffer, such as the contents of a log file.
+
+        The buffer can be any object supporting `find` and the buffer protocol, eg. bytes, bytearray or mmap,
+        and is scanned in one pass. The checksum and the decoding work on memoryview slices of the buffer so
+        no copies of the frames are made. Invalid frames and a truncated frame at the end of the buffer are
+        skipped, if provided `on_error` is called with the ValueError describing each of them.
+        """
+        for msg_cls, msg_id, payload in self.iter_frames(buff, on_error):
+            # Release each slice once decoded, an exception must not leave the buffer exported, eg. an mmap open
+            with payload:
+                msg = self._decode(msg_cls, msg_id, payload)
+            yield msg
+
+    def iter_frames(self, buff, on_error: Optional[Callable[[ValueError], Any]] = None
+                    ) -> Iterator[Tuple[int, int, memoryview]]:
+        """Same as `decode_bytes` but yield the class id, message id and payload of each frame without decoding.
+
+        The payload is a memoryview slice of the buffer, it must be copied if it is kept past the iteration.
+        """
+        end = len(buff)
+        pos = 0
+        with memoryview(buff) as view:
+            while True:
+                start, stop, err = self._scan(buff, pos, end, view)
+                if stop is None:
+                    self.discarded_bytes += end - start
+                    if end - start >= 2 and on_error is not None:
+                        on_error(ValueError("Truncated frame of {} bytes at the end of the data".format(end - start)))
+                    return
+
+                if err is not None:
+                    pos = self._skip_bad_frame(start, stop)
+                    if on_error is not None:
+                        on_error(err)
+                    continue
+
+                pos = stop
+
+                yield view[start + 2], view[start + 3], view[start + 6:stop - 2]
+
+    def decode_array(self, buff, cls_name: str, msg_name: str) -> 'numpy.ndarray':
+        """Return every message of one type within a complete buffer as a NumPy structured array.
+
+        The valid frames of the message are gathered from the buffer, eg. bytes or mmap, in one pass and
+        decoded together by `Message.parse_array`. Other and invalid frames are skipped. For messages with a
+        repeated block there is one row per block.
+        """
+        cls = self.get_cls_by_name(cls_name)
+        msg = self.get_msg_by_name(cls, msg_name)
+        # Fail before scanning if NumPy is missing or the fields cannot form a structured array
+        msg.dtype()
+
+        payloads = []
+        end = len(buff)
+        pos = 0
+        with memoryview(buff) as view:
+            while True:
+                start, stop, err = self._scan(buff, pos, end, view)
+                if stop is None:
+                    break
+
+                if err is not None:
+                    pos = self._skip_bad_frame(start, stop)
+                    continue
+
+                pos = stop
+                if view[start + 2] == cls.id_ and view[start + 3] == msg.id_:
+                    payloads.append(view[start + 6:stop - 2])
+
+            # The payloads are copied into the array before the views of the buffer are released
+            arr = msg.parse_array(payloads)
+            del payloads[:]
+
+        return arr
+
+    def iter_file(self, path: str, on_error: Optional[Callable[[ValueError], Any]] = None
+                  ) -> Iterator[Tuple[str, str, Any]]:
+        """Yield every message within a UBX log file.
+
+        The file is memory mapped and scanned in one pass by `decode_bytes`, see there for error handling.
+        Only the pages being decoded need to be in memory, so files larger than the available memory can be
+        processed.
+        """
+        with open(path, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return
 
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+                yield from self.decode_bytes(buff, on_error)
+
+    def _decode(self, msg_cls: int, msg_id: int, payload: bytes) -> Tuple[str, str, Any]:
+        """Return the message parsed from the payload in the configured mode."""
+        if self._columnar:
+            cls = self.classes[msg_cls]
+            name, nt = cls[msg_id].parse_columns(payload)
+            return cls.name, name, nt
+
+        if self._lazy:
+            cls = self.classes[msg_cls]
+            name, lazy = cls[msg_id].parse_lazy(payload)
+            return cls.name, name, lazy
+
+        return self.classes[msg_cls].parse(msg_id, payload)
+
+    def _receive_buffered(self, stream) -> Tuple[str, str, Any]:
+        """Buffered version of receive_from.
+
+        Invalid frames are skipped the same way as the unbuffered version before the ValueError is raised, any
+        bytes following them are kept. IOError is raised if a stream read returns no data before a complete
+        frame is available, the partial frame is kept and completed by the next call.
+        """
+        buff = self._input_buffer
+        while True:
+            start, stop, err = self._scan(buff, 0, len(buff))
+
+            if stop is None:
+                # Discard anything before a possible frame and read some more
+                del buff[:start]
+                chunk = self._read_chunk(stream, buff)
+                if not chunk:
+                    raise IOError("A stream read returned 0 bytes, expected a complete frame")
+                buff += chunk
+                continue
+
+            if err is not None:
+                del buff[:self._skip_bad_frame(start, stop)]
+                raise err
+
+            msg_cls = buff[start + 2]
+            msg_id = buff[start + 3]
+            payload = buff[start + 6:stop - 2]
+            del buff[:stop]
+
+            return self._decode(msg_cls, msg_id, payload)
+
+    def _read_chunk(self, stream, buff: bytearray) -> bytes:
+        """Read from the stream to progress the frame at the start of buff."""
+        waiting = getattr(stream, 'in_waiting', None)
+        if waiting is None:
+            return self._read_available(stream, self._read_size)
+        return stream.read(self._next_read_size(waiting, buff))
+
+    @staticmethod
+    def _read_available(stream, size: int) -> bytes:
+        """Read up to size bytes from a stream without waiting for more once some are available.
+
+        Buffered streams, eg. files of sockets or pipes, are read with `read1` as their `read` blocks until size
+        bytes are received. Other streams are read with `read`.
+        """
+        read1 = getattr(stream, 'read1', None)
+        if read1 is not None:
+            return read1(size)
+        return stream.read(size)
+
+    def _next_read_size(self, waiting: int, buff: bytearray) -> int:
+        """Return the number of bytes to read from a stream with `in_waiting` to progress the frame at buff[0].
+
+        Everything waiting is read up to `read_size`, but never less than the rest of the frame, so a slow
+        stream is not read byte by byte.
+        """
+        if len(buff) >= 6:
+            needed = 8 + self._HEADER.unpack_from(buff, 2)[2] - len(buff)
+        else:
+            # The shortest possible frame
+            needed = 8 - len(buff)
+
+        return max(min(waiting, self._read_size), needed)
+
+    def _scan(self, buff, pos: int, end: int, view: Optional[memoryview] = None
+              ) -> Tuple[int, Union[int, None], Union[ValueError, None]]:
+        """Locate the next frame within buff[pos:end].
+
+        If provided, the checksum is calculated over a slice of `view` rather than of buff to avoid a copy.
+
+        Return a tuple of (start, stop, error) where start is the index of the frame prefix.
+
+        If the frame is not yet complete stop is None, scanning should resume from start when more data is
+        available. Otherwise the frame ends at stop and error is None if the frame is valid. If the frame is
+        invalid the error is a ValueError, stop is then the index where the unbuffered version would resume.
+        """
+        while True:
+            start = buff.find(self.PREFIX, pos, end)
+            if start < 0:
+                # Keep the last byte in case it is the start of a prefix
+                if end > pos and buff[end - 1] == self.PREFIX[0]:
+                    self.discarded_bytes += end - 1 - pos
+                    return end - 1, None, None
+                self.discarded_bytes += end - pos
+                return end, None, None
+
+            self.discarded_bytes += start - pos
+
+            if end - start < 6:
+                return start, None, None
+
+            msg_cls, msg_id, length = self._HEADER.unpack_from(buff, start + 2)
+
+            if not self._filtered or self._subscribed(buff, start + 2, msg_cls, msg_id):
+                break
+
+            # Skip the frame without decoding it
+            err = self._skipped_length_error(msg_cls, msg_id, length)
+            if err is not None:
+                return start, start + 6, err
+            stop = start + 8 + length
+            if stop > end:
+                return start, None, None
+
+            if self._verify_skipped:
+                err = self._checksum_error((buff if view is None else view)[start + 2:stop - 2], buff[stop - 2:stop])
+                if err is not None:
+                    return start, stop, err
+
+            pos = stop
+
+        err = self._length_error(msg_cls, msg_id, length)
+        if err is not None:
+            return start, start + 6, err
+
+        stop = start + 8 + length
+        if stop > end:
+            return start, None, None
+
+        return start, stop, self._checksum_error((buff if view is None else view)[start + 2:stop - 2],
+                                                 buff[stop - 2:stop])
+
+    def _length_error(self, msg_cls: int, msg_id: int, length: int) -> Optional[ValueError]:
+        """Return a ValueError if the header is not of a registered message with a valid length, otherwise None.
+
+        Each entry of the length table holds the message it was built from. Messages registered with a class
+        after the class was registered with the parser, or replacing one, are added to the table when they are
+        first received.
+        """
+        cls = self.classes.get(msg_cls)
+        if cls is None:
+            return ValueError("Received unsupported message class of {:x}".format(msg_cls))
+        # noinspection PyProtectedMember
+        msg = cls._messages.get(msg_id)
+        if msg is None:
+            return ValueError("Received unsupported message id of {:x} in class {:x}".format(msg_id, msg_cls))
+
+        entry = self._lengths.get((msg_cls, msg_id))
+        if entry is None or entry[0] is not msg:
+            entry = self._lengths[(msg_cls, msg_id)] = (msg,) + msg.length_range(self._max_length)
+        _, shortest, longest, step = entry
+
+        if shortest <= length <= longest and (not step or not (length - shortest) % step):
+            return None
+
+        if length > self._max_length:
+            return self._max_length_error(length)
+
+        if step:
+            expected = '{} + n * {} up to {}'.format(shortest - step, step, longest)
+        else:
+            expected = '{}'.format(shortest)
+        return ValueError('The payload length of message {:x} in class {:x} is not valid. Expected {} actual {}'.format(
+            msg_id, msg_cls, expected, length))
+
+    def _skipped_length_error(self, msg_cls: int, msg_id: int, length: int) -> Optional[ValueError]:
+        """Return a ValueError if the length of a frame skipped by the subscriptions is not valid, otherwise None.
+
+        Registered messages are checked against the length table, others only against the maximum length.
+        """
+        if msg_cls in self.classes and msg_id in self.classes[msg_cls]:
+            return self._length_error(msg_cls, msg_id, length)
+        if length > self._max_length:
+            return self._max_length_error(length)
+        return None
+
+    def _max_length_error(self, length: int) -> ValueError:
+        return ValueError('The payload length of {} is longer than the maximum of {}'.format(length, self._max_length))
+
+    def _skip_bad_frame(self, start: int, stop: int) -> int:
+        """Count the invalid frame at start, found by `_scan`, and return the index to resume scanning from."""
+        resume = start + 1 if self._resync else stop
+        self.bad_frames += 1
+        self.discarded_bytes += resume - start
+        return resume
+
+    def _check_checksum(self, data: bytes, checksum_sup: bytes):
+        """Raise ValueError if the checksum of data does not match the supplied checksum."""
+        err = self._checksum_error(data, checksum_sup)
+        if err is not None:
+            raise err
+
+    def _checksum_error(self, data: bytes, checksum_sup: bytes) -> Optional[ValueError]:
+        """Return a ValueError if the checksum of data does not match the supplied checksum, otherwise None.
+
+        The error is not raised so that it does not hold a traceback referencing data, which may be a view.
+        """
+        checksum_cal = self._generate_fletcher_checksum(data)
         if checksum_cal != checksum_sup:
-            raise ValueError("Checksum mismatch. Calculated {:x} {:x}, received {:x} {:x}".format(
+            return ValueError("Checksum mismatch. Calculated {:x} {:x}, received {:x} {:x}".format(
                 checksum_cal[0], checksum_cal[1], checksum_sup[0], checksum_sup[1]
             ))
+        return None
 
-        return self.classes[msg_cls].parse(msg_id, payload)
+    def subscribe(self, subscription: Union[Iterable[Tuple[int, int]], Callable[[bytes], bool], None],
+                  verify_checksum: bool = False):
+        """Only decode the frames matching the subscription, other frames are skipped.
+
+        The subscription is either a collection of (class id, message id) pairs or a predicate called with the
+        4 header bytes of each frame, ie. class id, message id and the little endian length. Frames that do not
+        match are skipped straight after the header, whether their message is registered or not, and never
+        reach the decoder. Their checksum is only checked if `verify_checksum` is set. Pass None to decode all
+        frames again.
+        """
+        self._subscription = None
+        self._predicate = None
+        if subscription is None:
+            pass
+        elif callable(subscription):
+            self._predicate = subscription
+        else:
+            self._subscription = frozenset(subscription)
+
+        self._filtered = subscription is not None
+        self._verify_skipped = verify_checksum
+
+    def _subscribed(self, buff, header: int, msg_cls: int, msg_id: int) -> bool:
+        """Return whether the frame with the header at buff[header:header + 4] matches the subscription."""
+        if self._subscription is not None:
+            return (msg_cls, msg_id) in self._subscription
+        return self._predicate(bytes(buff[header:header + 4]))
 
     @staticmethod
     def _read_until(stream, terminator: bytes, size=None) -> bytes:
@@ -664,7 +1828,37 @@ class Parser:
 
     @staticmethod
     def _generate_fletcher_checksum(payload: bytes) -> bytes:
-        """Return the checksum for the provided payload"""
+        """Return the checksum for the provided payload
+
+        The modulo is deferred until the end so that the sums are done by the builtins rather than a loop
+        per byte. Large payloads are summed by NumPy if it is installed, otherwise the second sum is split
+        into 256 strided sums, as the weight of each byte modulo 256 repeats every 256 bytes.
+        """
+        length = len(payload)
+
+        if length > Parser._LARGE_CHECKSUM:
+            numpy = _numpy()
+            if numpy is not None:
+                data = numpy.frombuffer(payload, dtype=numpy.uint8)
+                check_a = int(data.sum(dtype=numpy.uint64))
+                check_b = int(numpy.cumsum(data, dtype=numpy.uint64).sum(dtype=numpy.uint64))
+            else:
+                check_a = sum(payload)
+                check_b = 0
+                for i in range(256):
+                    check_b += (length - i) * sum(payload[i::256])
+        else:
+            check_a = sum(payload)
+            check_b = sum(accumulate(payload))
+
+        return bytes((check_a & 0xFF, check_b & 0xFF))
+
+    @staticmethod
+    def _fletcher_checksum_reference(payload: bytes) -> bytes:
+        """Return the checksum for the provided payload one byte at a time, as per the data sheet.
+
+        This is the reference for `_generate_fletcher_checksum`.
+        """
         check_a = 0
         check_b = 0
 
@@ -676,4 +1870,3 @@ class Parser:
             check_b &= 0xFF
 
         return bytes((check_a, check_b))
-
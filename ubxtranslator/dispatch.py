@@ -0,0 +1,123 @@
+"""Route decoded messages to handlers by class and message id"""
+
+import mmap
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .core import Parser, Cls, Message
+
+__all__ = ['Dispatcher', ]
+
+
+class Dispatcher:
+    """Calls the handlers registered for each message received by a parser.
+
+    The handlers are kept in a flat table keyed by the integer (class id, message id) pair, so routing a frame
+    is a single dictionary lookup with no comparison of class or message names. Handlers are registered for a
+    single message or for every message of a class, and are called with the class id, message id and payload.
+
+    A frame is decoded at most once, in the mode configured on the parser, and the payload is shared by all of
+    its handlers. Handlers registered with `raw` set are called with the payload bytes instead, a frame that
+    only has raw handlers is never decoded.
+
+    Frames are pushed with `feed`, `dispatch_bytes` or `dispatch_file` which work like the parser methods of
+    the same name, or a frame received by other means can be passed to `dispatch`.
+    """
+    __slots__ = ['parser', '_handlers', ]
+
+    def __init__(self, parser: Parser):
+        self.parser = parser
+        # (class id, message id): (decoded handlers, raw handlers)
+        self._handlers: Dict[Tuple[int, int], Tuple[List[Callable], List[Callable]]] = {}
+
+    def register(self, handler: Callable[[int, int, Any], Any], cls: Union[Cls, int],
+                 msg: Union[Message, int, None] = None, raw: bool = False):
+        """Register a handler for a message, or for every message of the class if msg is not provided.
+
+        The class and message can be given as objects or ids, they must be registered with the parser.
+        Messages registered with the class afterwards are not covered by a class handler.
+        """
+        cls_id = cls.id_ if isinstance(cls, Cls) else cls
+        if cls_id not in self.parser.classes:
+            raise ValueError("A class of id {:x} has not been registered with the parser".format(cls_id))
+        parser_cls = self.parser.classes[cls_id]
+
+        if msg is None:
+            # noinspection PyProtectedMember
+            msg_ids = list(parser_cls._messages)
+        else:
+            msg_id = msg.id_ if isinstance(msg, Message) else msg
+            if msg_id not in parser_cls:
+                raise ValueError("A message of id {:x} has not been registered within {}".format(
+                    msg_id, parser_cls.name))
+            msg_ids = [msg_id]
+
+        for msg_id in msg_ids:
+            handlers = self._handlers.setdefault((cls_id, msg_id), ([], []))
+            handlers[1 if raw else 0].append(handler)
+
+    def unregister(self, handler: Callable[[int, int, Any], Any]):
+        """Remove the handler from every message it was registered for."""
+        for key, handlers in list(self._handlers.items()):
+            for registered in handlers:
+                while handler in registered:
+                    registered.remove(handler)
+            if not handlers[0] and not handlers[1]:
+                del self._handlers[key]
+
+    def subscribe(self, verify_checksum: bool = False):
+        """Subscribe the parser to the messages that have handlers, so other frames are skipped undecoded.
+
+        This replaces any subscription of the parser, see `Parser.subscribe`.
+        """
+        self.parser.subscribe(list(self._handlers), verify_checksum)
+
+    def dispatch(self, msg_cls: int, msg_id: int, payload: bytes) -> bool:
+        """Call the handlers of a frame with its payload bytes. Return whether the frame had any handlers."""
+        handlers = self._handlers.get((msg_cls, msg_id))
+        if handlers is None:
+            return False
+
+        decoded, raw = handlers
+        for handler in raw:
+            handler(msg_cls, msg_id, payload)
+
+        if decoded:
+            # noinspection PyProtectedMember
+            nt = self.parser._decode(msg_cls, msg_id, payload)[2]
+            for handler in decoded:
+                handler(msg_cls, msg_id, nt)
+
+        return True
+
+    def feed(self, data: bytes, on_error: Optional[Callable[[ValueError], Any]] = None) -> int:
+        """Feed data to the parser and dispatch the complete frames, see `Parser.feed`.
+
+        Return the number of frames dispatched to at least one handler.
+        """
+        count = 0
+        for msg_cls, msg_id, payload in self.parser.feed_frames(data, on_error):
+            count += self.dispatch(msg_cls, msg_id, payload)
+        return count
+
+    def dispatch_bytes(self, buff, on_error: Optional[Callable[[ValueError], Any]] = None) -> int:
+        """Dispatch every frame within a complete buffer, see `Parser.decode_bytes`.
+
+        Raw handlers are called with memoryview slices of the buffer, which must be copied to be kept as they are
+        released once the frame is dispatched.
+        Return the number of frames dispatched to at least one handler.
+        """
+        count = 0
+        for msg_cls, msg_id, payload in self.parser.iter_frames(buff, on_error):
+            # Release each slice once dispatched, an exception must not leave the buffer exported, eg. an mmap open
+            with payload:
+                count += self.dispatch(msg_cls, msg_id, payload)
+        return count
+
+    def dispatch_file(self, path: str, on_error: Optional[Callable[[ValueError], Any]] = None) -> int:
+        """Dispatch every frame within a UBX log file, see `Parser.iter_file` and `dispatch_bytes`."""
+        with open(path, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return 0
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+                return self.dispatch_bytes(buff, on_error)
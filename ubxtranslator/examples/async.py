@@ -29,22 +29,19 @@ class GnssService:
                     url=self.port, baudrate=self.baud_rate
                 )
                 print(f"Starting to listen for UBX packets on {self.port}")
-                while True:
-                    try:
-                        msg = await self.parser.receive_from_async(reader)
-                        if msg:
-                            self.last_message = msg
-                            self.new_message_event.set()
-
-                    except (ValueError, IOError, asyncio.IncompleteReadError) as e:
-                        print(f"Error parsing UBX message: {e}")
-                        continue
+                async for msg in self.parser.stream(reader, on_error=self.on_error):
+                    self.last_message = msg
+                    self.new_message_event.set()
 
             except Exception as e:
                 print(f"Could not open serial port {self.port}: {e}")
                 # Wait before trying to reconnect
                 await asyncio.sleep(5)
 
+    @staticmethod
+    def on_error(e):
+        print(f"Error parsing UBX message: {e}")
+
     async def print_last_message(self):
         """An event based approach to consumption."""
         while True:
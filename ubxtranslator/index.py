@@ -0,0 +1,235 @@
+"""An index of the frames within a UBX capture for random access"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterator, Tuple, Any, Optional, Callable
+
+from .core import Parser, Message, Field
+
+__all__ = ['FrameIndex', ]
+
+
+class FrameIndex:
+    """An index of every valid frame within a UBX capture.
+
+    The offset, class id, message id, payload length and iTOW of each frame are kept in compact arrays, one
+    entry per frame in the order they appear in the capture. The iTOW is only known for the messages
+    registered with the parser used to build the index that have a U4 `iTOW` field before any repeated block,
+    for other frames it is `NO_ITOW`.
+
+    Frames are valid if the checksum matches, they do not need to be registered with the parser. After an
+    invalid frame the scan resumes straight after its prefix, so no valid frame is missed.
+
+    The index can be saved next to the capture, see `for_file`, and queried to decode only the matching frames
+    without scanning the capture again.
+    """
+    __slots__ = ['offsets', 'cls_ids', 'msg_ids', 'lengths', 'itows', ]
+
+    MAGIC = b'UBXIDX02'
+    NO_ITOW = 0xFFFFFFFF
+    SUFFIX = '.idx'
+
+    _FILE_HEADER = struct.Struct('<8sQQq')
+
+    def __init__(self):
+        self.offsets = array('Q')
+        self.cls_ids = array('B')
+        self.msg_ids = array('B')
+        self.lengths = array('H')
+        self.itows = array('I')
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def build(cls, buff, parser: Optional[Parser] = None) -> 'FrameIndex':
+        """Return the index of the frames within buff, eg. bytes or mmap.
+
+        If provided the parser's registered messages are used to find the iTOW of the frames.
+        """
+        index = cls()
+        itow_offsets = {}
+        if parser is not None:
+            for cls_ in parser.classes.values():
+                # noinspection PyProtectedMember
+                for msg in cls_._messages.values():
+                    offset = _itow_offset(msg)
+                    if offset is not None:
+                        itow_offsets[(cls_.id_, msg.id_)] = offset
+
+        header = Parser._HEADER
+        checksum = Parser._generate_fletcher_checksum
+        end = len(buff)
+        pos = 0
+        with memoryview(buff) as view:
+            while True:
+                start = buff.find(Parser.PREFIX, pos, end)
+                if start < 0 or start + 8 > end:
+                    break
+
+                cls_id, msg_id, length = header.unpack_from(view, start + 2)
+                stop = start + 8 + length
+                if stop > end or checksum(view[start + 2:stop - 2]) != view[stop - 2:stop]:
+                    pos = start + 1
+                    continue
+
+                itow = index.NO_ITOW
+                offset = itow_offsets.get((cls_id, msg_id))
+                if offset is not None and offset + 4 <= length:
+                    itow = _ITOW.unpack_from(view, start + 6 + offset)[0]
+
+                index.offsets.append(start)
+                index.cls_ids.append(cls_id)
+                index.msg_ids.append(msg_id)
+                index.lengths.append(length)
+                index.itows.append(itow)
+                pos = stop
+
+        return index
+
+    @classmethod
+    def for_file(cls, path: str, parser: Optional[Parser] = None, rebuild: bool = False) -> 'FrameIndex':
+        """Return the index of a capture file, loaded from the index file next to it if there is one.
+
+        The index is built and saved to `path + SUFFIX` if the index file does not exist, does not match the
+        size and modification time of the capture, or if `rebuild` is set.
+        """
+        index_path = path + cls.SUFFIX
+        stat = os.stat(path)
+        size = stat.st_size
+        if not rebuild and os.path.exists(index_path):
+            try:
+                index, indexed_size, indexed_mtime_ns = cls._load(index_path)
+                if indexed_size == size and indexed_mtime_ns == stat.st_mtime_ns:
+                    return index
+            except ValueError:
+                pass
+
+        with open(path, 'rb') as f:
+            if size == 0:
+                index = cls()
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+                    index = cls.build(buff, parser)
+
+        index.save(index_path, size, stat.st_mtime_ns)
+        return index
+
+    def save(self, path: str, size: int = 0, mtime_ns: int = 0):
+        """Save the index to a file, size and mtime_ns are the size and modification time of the indexed capture."""
+        with open(path, 'wb') as f:
+            f.write(self._FILE_HEADER.pack(self.MAGIC, len(self), size, mtime_ns))
+            for arr in self._arrays():
+                if sys.byteorder == 'big':
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                arr.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> 'FrameIndex':
+        """Load an index saved with `save`. Raise ValueError if the file is not a valid index."""
+        return cls._load(path)[0]
+
+    @classmethod
+    def _load(cls, path: str) -> Tuple['FrameIndex', int, int]:
+        """Return the index saved within a file and the size and modification time of the indexed capture."""
+        index = cls()
+        with open(path, 'rb') as f:
+            header = f.read(cls._FILE_HEADER.size)
+            if len(header) != cls._FILE_HEADER.size:
+                raise ValueError("The index file {} is too short".format(path))
+
+            magic, count, size, mtime_ns = cls._FILE_HEADER.unpack(header)
+            if magic != cls.MAGIC:
+                raise ValueError("The file {} is not a frame index".format(path))
+
+            for arr in index._arrays():
+                try:
+                    arr.fromfile(f, count)
+                except EOFError:
+                    raise ValueError("The index file {} is truncated".format(path))
+                if sys.byteorder == 'big':
+                    arr.byteswap()
+
+        return index, size, mtime_ns
+
+    def select(self, cls_id: Optional[int] = None, msg_id: Optional[int] = None,
+               itow_min: Optional[int] = None, itow_max: Optional[int] = None) -> Iterator[int]:
+        """Yield the positions within the index of the matching frames.
+
+        The iTOW range is inclusive, frames without an iTOW never match a range.
+        """
+        check_itow = itow_min is not None or itow_max is not None
+        if itow_min is None:
+            itow_min = 0
+        if itow_max is None:
+            itow_max = self.NO_ITOW - 1
+
+        for i, (c, m, itow) in enumerate(zip(self.cls_ids, self.msg_ids, self.itows)):
+            if cls_id is not None and c != cls_id:
+                continue
+            if msg_id is not None and m != msg_id:
+                continue
+            if check_itow and not itow_min <= itow <= itow_max:
+                continue
+            yield i
+
+    def query(self, parser: Parser, buff, cls_id: Optional[int] = None, msg_id: Optional[int] = None,
+              itow_min: Optional[int] = None, itow_max: Optional[int] = None,
+              on_error: Optional[Callable[[ValueError], Any]] = None) -> Iterator[Tuple[str, str, Any]]:
+        """Decode the matching frames of the indexed buffer, see `select`.
+
+        The frames are sliced straight out of the buffer without scanning it, frames of messages not
+        registered with the parser are skipped. Frames with a payload length that is not valid for their
+        message are skipped too, if provided `on_error` is called with the ValueError describing each of them.
+        """
+        with memoryview(buff) as view:
+            for i in self.select(cls_id, msg_id, itow_min, itow_max):
+                c = self.cls_ids[i]
+                m = self.msg_ids[i]
+                if c not in parser.classes or m not in parser.classes[c]:
+                    continue
+
+                # noinspection PyProtectedMember
+                err = parser._length_error(c, m, self.lengths[i])
+                if err is not None:
+                    if on_error is not None:
+                        on_error(err)
+                    continue
+
+                start = self.offsets[i] + 6
+                # noinspection PyProtectedMember
+                yield parser._decode(c, m, view[start:start + self.lengths[i]])
+
+    def query_file(self, parser: Parser, path: str, cls_id: Optional[int] = None, msg_id: Optional[int] = None,
+                   itow_min: Optional[int] = None, itow_max: Optional[int] = None,
+                   on_error: Optional[Callable[[ValueError], Any]] = None) -> Iterator[Tuple[str, str, Any]]:
+        """Decode the matching frames of the indexed capture file, see `query`."""
+        if len(self) == 0:
+            return
+
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+                yield from self.query(parser, buff, cls_id, msg_id, itow_min, itow_max, on_error)
+
+    def _arrays(self):
+        return self.offsets, self.cls_ids, self.msg_ids, self.lengths, self.itows
+
+
+_ITOW = struct.Struct('<I')
+
+
+def _itow_offset(msg: Message) -> Optional[int]:
+    """Return the offset of the iTOW field within the message payload, None if there isn't one."""
+    offset = 0
+    # noinspection PyProtectedMember
+    for field in msg._fields:
+        if field.repeated_block:
+            return None
+        if isinstance(field, Field) and field.name == 'iTOW':
+            return offset if field.fmt == 'I' else None
+        offset += struct.calcsize('<' + field.fmt)
+    return None
@@ -0,0 +1,111 @@
+"""Read many UBX sources from a single thread"""
+
+import os
+import selectors
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .core import Parser, Cls
+
+__all__ = ['Multiplexer', ]
+
+
+class Multiplexer:
+    """Decodes the messages of many sources, eg. serial ports or sockets, waiting on all of them at once.
+
+    The sources are watched with a selector, so a single thread serves every receiver instead of a thread per
+    port. Each source has its own parser, so partial frames of different sources are never mixed, and all of
+    them share the same message class definitions. Every message is returned with the id of its source.
+
+    A source must provide `fileno`, which excludes serial ports on Windows. Sockets are read with `recv`,
+    other sources with `read` of their `in_waiting` bytes if they provide it. Any other source, eg. a pipe, is
+    read up to `read_size` bytes straight from its file descriptor. A buffered file object would otherwise
+    block on a partial chunk or hold bytes the selector cannot see, so bytes it buffered before it was added
+    are not read. A source that reads no data has been closed and is removed, if provided `on_close` is
+    called with its id. If provided `on_error` is called with the source id and the ValueError describing each
+    invalid frame.
+
+    The remaining keyword arguments are passed to the parser of each source, see `Parser`.
+    """
+
+    def __init__(self, classes: List[Cls], read_size: int = 4096,
+                 on_error: Optional[Callable[[Hashable, ValueError], Any]] = None,
+                 on_close: Optional[Callable[[Hashable], Any]] = None, **parser_kwargs):
+        self.classes = classes
+        self.read_size = read_size
+        self._on_error = on_error
+        self._on_close = on_close
+        self._parser_kwargs = parser_kwargs
+        self._selector = selectors.DefaultSelector()
+        self._sources: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def add(self, source_id: Hashable, source) -> Parser:
+        """Start reading a source, return the parser decoding it."""
+        if source_id in self._sources:
+            raise ValueError("A source of id {!r} has already been added".format(source_id))
+
+        parser = Parser(self.classes, read_size=self.read_size, **self._parser_kwargs)
+        self._selector.register(source, selectors.EVENT_READ, (source_id, parser))
+        self._sources[source_id] = source
+        return parser
+
+    def remove(self, source_id: Hashable):
+        """Stop reading a source, any partial frame received from it is discarded. The source is not closed."""
+        self._selector.unregister(self._sources.pop(source_id))
+
+    def close(self):
+        """Stop reading every source and close the selector."""
+        for source_id in list(self._sources):
+            self.remove(source_id)
+        self._selector.close()
+
+    def poll(self, timeout: Optional[float] = None) -> List[Tuple[Hashable, str, str, Any]]:
+        """Wait for data from any of the sources, up to timeout seconds, and return the messages decoded.
+
+        Each message is a tuple of (source id, class name, message name, payload). The list is empty if the
+        timeout expired first.
+        """
+        return self._handle(self._selector.select(timeout))
+
+    def messages(self, timeout: Optional[float] = None) -> Iterator[Tuple[Hashable, str, str, Any]]:
+        """Yield the messages of every source until all of them are closed, see `poll`.
+
+        If timeout is set the iteration also stops once no data is received for that many seconds.
+        """
+        while self._sources:
+            events = self._selector.select(timeout)
+            if not events and timeout is not None:
+                return
+            yield from self._handle(events)
+
+    def _handle(self, events: List[Tuple[selectors.SelectorKey, int]]) -> List[Tuple[Hashable, str, str, Any]]:
+        """Read the sources that are ready and return the messages decoded."""
+        msgs = []
+        for key, _ in events:
+            source_id, parser = key.data
+            data = self._read(key.fileobj)
+            if not data:
+                self.remove(source_id)
+                if self._on_close is not None:
+                    self._on_close(source_id)
+                continue
+
+            on_error = None if self._on_error is None else partial(self._on_error, source_id)
+            for msg in parser.feed(data, on_error):
+                msgs.append((source_id,) + msg)
+
+        return msgs
+
+    def _read(self, source) -> bytes:
+        recv = getattr(source, 'recv', None)
+        if recv is not None:
+            return recv(self.read_size)
+
+        waiting = getattr(source, 'in_waiting', None)
+        if waiting is not None:
+            return source.read(waiting or self.read_size)
+
+        return os.read(source.fileno(), self.read_size)
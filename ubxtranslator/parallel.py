@@ -0,0 +1,145 @@
+"""Decode large captures in parallel with a pool of processes"""
+
+import math
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from .core import Parser, Cls
+
+__all__ = ['decode_file', 'shard_offsets', ]
+
+
+def decode_file(path: str, classes: List[Cls], processes: Optional[int] = None, shards: Optional[int] = None,
+                transform: Optional[Callable[[List[Tuple[str, str, Any]]], Any]] = None, mp_context=None,
+                shard_size: int = 8 * 1024 * 1024, **parser_kwargs) -> Iterator[Any]:
+    """Decode a UBX capture file with a pool of processes, yielding the results in the order of the frames.
+
+    The capture is split into `shards` byte ranges, by default ranges of about `shard_size` bytes and at least
+    one per process, each starting at a frame found by `shard_offsets`. Only two ranges per process are
+    submitted at a time, the next range is submitted as the result of the oldest is yielded, so the results
+    waiting in this process are bounded however large the capture and however slow the consumer. Each process
+    memory maps the capture and decodes whole ranges with a parser of the classes, built with the remaining
+    keyword arguments, the same way `Parser.decode_bytes` would. Invalid frames are skipped.
+
+    Without `transform` every message is yielded, in order, as a tuple of (class name, message name, payload).
+    The payloads are pickled back from the processes, which is done by this process alone. If `transform` is
+    provided it is called within the processes with the list of messages of each range and the result is
+    yielded for each range in order instead. Reducing the messages there, for example to columns or to
+    statistics, keeps this process from being the bottleneck. `transform` must be picklable, eg. a module
+    level function.
+
+    `processes` and `mp_context` are passed to the `ProcessPoolExecutor`.
+    """
+    if parser_kwargs.get('lazy'):
+        raise ValueError("Lazy payloads are of subclasses created for each message, which cannot be pickled")
+    if parser_kwargs.get('buffered'):
+        raise ValueError("Buffered parsers only apply to reading streams, the ranges of a file are scanned whole")
+
+    workers = processes or os.cpu_count() or 1
+    if not shards:
+        shards = max(workers, math.ceil(os.path.getsize(path) / shard_size))
+    offsets = shard_offsets(path, shards)
+    ranges = [(path, start, stop) for start, stop in zip(offsets, offsets[1:]) if start < stop]
+    if not ranges:
+        return
+
+    with ProcessPoolExecutor(processes, mp_context, initializer=_init_worker,
+                             initargs=(classes, parser_kwargs, transform)) as executor:
+        ranges = iter(ranges)
+        pending = deque(executor.submit(_decode_range, args) for args in islice(ranges, workers * 2))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(executor.submit(_decode_range, args) for args in islice(ranges, 1))
+                if transform is None:
+                    yield from result
+                else:
+                    yield result
+        finally:
+            # The iteration was stopped early, do not decode the ranges that are not needed anymore
+            for future in pending:
+                future.cancel()
+
+
+def shard_offsets(path: str, shards: int) -> List[int]:
+    """Return the offsets splitting a capture file into about equal ranges that each start with a frame.
+
+    The offsets start with 0 and end with the size of the file. Each offset in between is the first frame at
+    or after an even split of the file, such that the frame is valid, ie. its checksum matches, and it is
+    followed by another frame prefix or by the end of the file. Checking the following prefix makes it very
+    unlikely that a frame is found within the payload of another, which would decode bytes twice. Offsets
+    may repeat if a range contains no frame.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [0, 0]
+
+    step = math.ceil(size / max(shards, 1))
+    offsets = [0]
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+            for split in range(step, size, step):
+                offsets.append(_sync(buff, max(split, offsets[-1]), size))
+    offsets.append(size)
+    return offsets
+
+
+def _sync(buff, pos: int, end: int) -> int:
+    """Return the index of the first frame within buff[pos:end] followed by a prefix, end if there is none."""
+    prefix = Parser.PREFIX
+    header = Parser._HEADER
+    with memoryview(buff) as view:
+        while True:
+            start = buff.find(prefix, pos, end)
+            if start < 0 or start + 8 > end:
+                return end
+
+            stop = start + 8 + header.unpack_from(buff, start + 2)[2]
+            followed = stop == end or (stop < end and buff[stop:stop + 2] == prefix[:end - stop])
+            # noinspection PyProtectedMember
+            if followed and Parser._generate_fletcher_checksum(view[start + 2:stop - 2]) == buff[stop - 2:stop]:
+                return start
+
+            pos = start + 1
+
+
+# The parser and transform of a worker process, set by _init_worker
+_worker = None
+
+
+def _init_worker(classes: List[Cls], parser_kwargs: dict, transform: Optional[Callable]):
+    global _worker
+    _worker = Parser(classes, **parser_kwargs), transform
+
+
+def _decode_range(args: Tuple[str, int, int]) -> Any:
+    """Decode the frames starting within [start, stop) of the capture file."""
+    path, start, stop = args
+    parser, transform = _worker
+
+    msgs = []
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+            end = len(buff)
+            with memoryview(buff) as view:
+                pos = start
+                while True:
+                    # noinspection PyProtectedMember
+                    first, last, err = parser._scan(buff, pos, end, view)
+                    if last is None or first >= stop:
+                        break
+
+                    if err is not None:
+                        # noinspection PyProtectedMember
+                        pos = parser._skip_bad_frame(first, last)
+                        continue
+
+                    pos = last
+                    # noinspection PyProtectedMember
+                    msgs.append(parser._decode(view[first + 2], view[first + 3], view[first + 6:last - 2]))
+
+    return msgs if transform is None else transform(msgs)
@@ -1,6 +1,6 @@
 import unittest
 
-from . import test_core, test_fields, test_async, test_transfer
+from . import test_core, test_fields, test_async, test_transfer, test_index, test_dispatch, test_aio, test_mux, test_parallel, test_commands
 
 
 def suite():
@@ -23,6 +23,25 @@ def suite():
     # test transfer
     suite.addTest(test_transfer.UbxTransferTester())
 
+    # test index
+    suite.addTest(test_index.UbxFrameIndexTester())
+
+    # test dispatch
+    suite.addTest(test_dispatch.UbxDispatcherTester())
+
+    # test aio
+    suite.addTest(test_aio.UbxProtocolTester())
+
+    # test mux
+    suite.addTest(test_mux.UbxMultiplexerTester())
+
+    # test parallel
+    suite.addTest(test_parallel.UbxParallelTester())
+
+    # test commands
+    suite.addTest(test_commands.UbxCommanderTester())
+    suite.addTest(test_commands.UbxAsyncCommanderTester())
+
     return suite
 
 
@@ -0,0 +1,11 @@
+"""Helpers shared by the test modules"""
+
+import struct
+
+from ubxtranslator.core import Parser
+
+
+def packet(cls_id: int, msg_id: int, payload: bytes) -> bytes:
+    """Return a UBX frame of the payload with a valid header and checksum."""
+    body = struct.pack('<BBH', cls_id, msg_id, len(payload)) + payload
+    return Parser.PREFIX + body + Parser._generate_fletcher_checksum(body)
@@ -0,0 +1,77 @@
+"""Basic unit testing of the aio module"""
+
+import asyncio
+import socket
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.aio import UBXProtocol
+from ubxtranslator.tests.helpers import packet
+
+
+class MockTransport:
+    def __init__(self):
+        self.reading = True
+
+    def pause_reading(self):
+        self.reading = False
+
+    def resume_reading(self):
+        self.reading = True
+
+
+class UbxProtocolTester(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cls = Cls(1, 'TEST', [Message(1, 'ONE', [Field('F1', 'U1')])])
+        self.data = b''.join(packet(1, 1, bytes([i])) for i in range(10))
+
+    async def test_connection(self):
+        loop = asyncio.get_running_loop()
+        rsock, wsock = socket.socketpair()
+        try:
+            _, protocol = await loop.create_connection(lambda: UBXProtocol(Parser([self.cls])), sock=rsock)
+            wsock.sendall(self.data[:15])
+            wsock.sendall(self.data[15:])
+            wsock.close()
+
+            self.assertEqual([msg.F1 async for _, _, msg in protocol], list(range(10)))
+            with self.assertRaises(IOError):
+                await protocol.get()
+        finally:
+            wsock.close()
+
+    async def test_callback(self):
+        msgs = []
+        errors = []
+        protocol = UBXProtocol(Parser([self.cls]), lambda *msg: msgs.append(msg), errors.append)
+        protocol.connection_made(MockTransport())
+
+        bad = bytearray(packet(1, 1, b'\x00'))
+        bad[-1] ^= 0xFF
+        for i in range(0, len(self.data), 7):
+            protocol.data_received(self.data[i:i + 7])
+        protocol.data_received(bytes(bad))
+
+        self.assertEqual([msg[2].F1 for msg in msgs], list(range(10)))
+        self.assertEqual(msgs[0][:2], ('TEST', 'ONE'))
+        self.assertEqual(len(errors), 1)
+
+    async def test_max_queue(self):
+        transport = MockTransport()
+        protocol = UBXProtocol(Parser([self.cls]), max_queue=4)
+        protocol.connection_made(transport)
+
+        protocol.data_received(self.data[:5 * 9])
+        self.assertFalse(transport.reading)
+
+        for i in range(3):
+            self.assertEqual((await protocol.get())[2].F1, i)
+        self.assertTrue(transport.reading)
+
+    def test_buffered(self):
+        with self.assertRaises(ValueError):
+            UBXProtocol(Parser([self.cls], buffered=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
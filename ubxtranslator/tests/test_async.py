@@ -1,6 +1,7 @@
 import unittest
 import asyncio
 from ubxtranslator.core import *
+from ubxtranslator.tests.helpers import packet
 
 
 class MockStreamReader:
@@ -81,6 +82,65 @@ class UbxAsyncParserTester(unittest.IsolatedAsyncioTestCase):
             with self.assertRaises(asyncio.IncompleteReadError):
                 await parser.receive_from_async(test_stream)
 
+    async def test_parser_async_subscribe(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+        ])
+        parser = Parser([cls])
+        parser.subscribe([(1, 1)])
+
+        data = packet(9, 9, bytes([1, 2])) + packet(1, 1, bytes([7]))
+
+        cls_name, msg_name, msg = await parser.receive_from_async(MockStreamReader(data))
+        self.assertEqual((msg_name, msg.F1), ('ONE', 7))
+
+    async def test_parser_async_length(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+        ])
+        parser = Parser([cls])
+
+        good = packet(1, 1, bytes([7]))
+        # The header claims a long payload, readexactly would fail on the end of the data if it was awaited
+        stream = MockStreamReader(parser.PREFIX + bytes([1, 1, 0xFF, 0xFF]) + good)
+
+        with self.assertRaises(ValueError):
+            await parser.receive_from_async(stream)
+        cls_name, msg_name, msg = await parser.receive_from_async(stream)
+        self.assertEqual(msg.F1, 7)
+
+        # Also when the frame is of a registered message skipped by the subscriptions
+        parser.register_cls(Cls(2, 'OTHER', [Message(1, 'ONE', [Field('F1', 'U1')])]))
+        parser.subscribe([(2, 1)])
+        stream = MockStreamReader(parser.PREFIX + bytes([1, 1, 0xFF, 0xFF]) + packet(2, 1, bytes([8])))
+
+        with self.assertRaises(ValueError):
+            await parser.receive_from_async(stream)
+        cls_name, msg_name, msg = await parser.receive_from_async(stream)
+        self.assertEqual((cls_name, msg.F1), ('OTHER', 8))
+
+    async def test_parser_stream(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+        ])
+
+        data = b''.join(packet(1, 1, bytes([i])) for i in range(10))
+        bad = bytearray(data[:9])
+        bad[-1] ^= 0xFF
+        data += bytes(bad) + data[:5]
+
+        parser = Parser([cls], read_size=20)
+        errors = []
+        msgs = [msg async for msg in parser.stream(MockStreamReader(data), on_error=errors.append)]
+        self.assertEqual([msg.F1 for _, _, msg in msgs], list(range(10)))
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(parser.bad_frames, 1)
+        self.assertEqual(parser.discarded_bytes, 9 + 5)
+
+        batches = [batch async for batch in parser.stream(MockStreamReader(data), batch=True)]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 2, 2, 2])
+        self.assertEqual(batches[-1][-1][2].F1, 9)
+
     async def test_read_until_async(self):
         data = b"some junk" + Parser.PREFIX + b"more data"
         stream = MockStreamReader(data)
@@ -0,0 +1,235 @@
+"""Basic unit testing of the commands module"""
+
+import asyncio
+import socket
+import struct
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.commands import Commander, AsyncCommander
+from ubxtranslator.predefined import ACK_CLS
+from ubxtranslator.tests.helpers import packet
+
+
+CFG_CLS = Cls(0x06, 'CFG', [
+    Message(0x01, 'MSG', [Field('msgClass', 'U1'), Field('msgID', 'U1'), Field('rate', 'U1')]),
+    Message(0x02, 'INF', [RepeatedBlock('RB', [Field('protocolID', 'U1')])]),
+    Message(0x08, 'RATE', [Field('measRate', 'U2'), Field('navRate', 'U2'), Field('timeRef', 'U2')]),
+])
+
+
+class Receiver:
+    """A fake receiver replying to each command once it is read, with a NAV message before each reply.
+
+    Commands with a rate of 0xFF are rejected.
+    """
+
+    def __init__(self):
+        self.parser = Parser([CFG_CLS])
+        self.replies = []
+        self.writes = 0
+        self.timeout = 0
+
+    def reply(self, data):
+        self.writes += 1
+        for msg_cls, msg_id, payload in self.parser.feed_frames(data):
+            nak = msg_id == 0x01 and payload[2] == 0xFF
+            self.replies.append(packet(0x01, 0x20, b'\x07') + packet(0x05, 0x00 if nak else 0x01,
+                                                                      bytes([msg_cls, msg_id])))
+
+    def write(self, data):
+        self.reply(data)
+
+    def read(self, size):
+        # Replies are received one at a time, split across reads
+        if not self.replies:
+            return b''
+        data = self.replies[0][:size]
+        self.replies[0] = self.replies[0][size:]
+        if not self.replies[0]:
+            del self.replies[0]
+        return data
+
+
+class UbxCommanderTester(unittest.TestCase):
+    def setUp(self):
+        self.parser = Parser([CFG_CLS, Cls(0x01, 'NAV', [Message(0x20, 'TIMEGPS', [Field('F1', 'U1')])])])
+        self.msgs = []
+
+    def prepare(self, rate):
+        msg_dict = self.parser.prepare_msg('CFG', 'MSG')
+        msg_dict['rate'] = rate
+        return msg_dict
+
+    def test_predefined_ack(self):
+        self.assertEqual(ACK_CLS[0x01].name, 'ACK')
+        self.assertEqual(ACK_CLS[0x00].name, 'NAK')
+
+    def test_send(self):
+        receiver = Receiver()
+        commander = Commander(self.parser, receiver, window=2, on_message=lambda *msg: self.msgs.append(msg))
+        self.assertIn(ACK_CLS.id_, self.parser.classes)
+
+        futures = [commander.send(self.prepare(rate)) for rate in (1, 0xFF, 2)]
+        # The third command waited for the first reply
+        self.assertTrue(futures[0].done())
+        self.assertEqual(len(commander), 2)
+
+        commander.wait(timeout=1)
+        self.assertEqual([future.result() for future in futures], [True, False, True])
+        self.assertEqual(len(commander), 0)
+        self.assertEqual([(name, msg.F1) for _, name, msg in self.msgs], [('TIMEGPS', 7)] * 3)
+
+    def test_send_many(self):
+        receiver = Receiver()
+        commander = Commander(self.parser, receiver, window=4)
+
+        futures = commander.send_many([self.prepare(rate) for rate in range(10)])
+        commander.wait(futures[-2:])
+        self.assertTrue(all(future.result() for future in futures[:-2]))
+        commander.wait()
+        self.assertTrue(all(future.result() for future in futures))
+        # The first window is written at once, then each reply makes room for one more command
+        self.assertEqual(receiver.writes, 1 + 6)
+
+    def test_timeout(self):
+        receiver = Receiver()
+        receiver.write = lambda data: None
+        commander = Commander(self.parser, receiver, window=1)
+        commander.send(self.prepare(1))
+        with self.assertRaises(TimeoutError):
+            commander.send(self.prepare(2), timeout=0.01)
+
+        del receiver.timeout
+        with self.assertRaises(IOError):
+            commander.wait()
+
+        with self.assertRaises(ValueError):
+            Commander(self.parser, receiver, window=0)
+
+    def test_send_failure(self):
+        receiver = Receiver()
+        commander = Commander(self.parser, receiver, window=2)
+
+        # A command that cannot be packed is not left waiting for the reply of the next one
+        bad = self.parser.prepare_msg('CFG', 'INF')
+        bad['RB'] = []
+        with self.assertRaises(ValueError):
+            commander.send(bad)
+        with self.assertRaises(ValueError):
+            commander.send_many([self.prepare(1), bad])
+        with self.assertRaises(ValueError):
+            commander.send({})
+        self.assertEqual(len(commander), 0)
+
+        good = self.parser.prepare_msg('CFG', 'INF')
+        future = commander.send(good)
+        commander.wait(timeout=1)
+        self.assertTrue(future.result())
+
+    def test_socket_file(self):
+        rsock, wsock = socket.socketpair()
+        rsock.settimeout(5)
+        try:
+            with rsock.makefile('rwb') as stream:
+                commander = Commander(self.parser, stream, window=1)
+                futures = []
+                for rate in (1, 2):
+                    futures.append(commander.send(self.prepare(rate)))
+                    # Reply with the ACK alone, far less than a read chunk
+                    wsock.sendall(packet(0x05, 0x01, bytes([0x06, 0x01])))
+                commander.wait(timeout=5)
+                self.assertEqual([future.result() for future in futures], [True, True])
+        finally:
+            rsock.close()
+            wsock.close()
+
+
+class AsyncReceiver(Receiver):
+    def __init__(self):
+        super().__init__()
+        self.event = asyncio.Event()
+        self.closed = False
+
+    def write(self, data):
+        self.reply(data)
+        self.event.set()
+
+    async def drain(self):
+        pass
+
+    async def read(self, size):
+        while not self.replies:
+            if self.closed:
+                return b''
+            self.event.clear()
+            await self.event.wait()
+        return super().read(size)
+
+    def close(self):
+        self.closed = True
+        self.event.set()
+
+
+class UbxAsyncCommanderTester(unittest.IsolatedAsyncioTestCase):
+    async def test_send_many(self):
+        parser = Parser([CFG_CLS, Cls(0x01, 'NAV', [Message(0x20, 'TIMEGPS', [Field('F1', 'U1')])])])
+        receiver = AsyncReceiver()
+        msgs = []
+        commander = AsyncCommander(parser, receiver, receiver, window=3, on_message=lambda *msg: msgs.append(msg))
+        task = asyncio.ensure_future(commander.run())
+
+        commands = []
+        for rate in (1, 0xFF, 2, 3, 4):
+            msg_dict = parser.prepare_msg('CFG', 'MSG')
+            msg_dict['rate'] = rate
+            commands.append(msg_dict)
+
+        futures = await commander.send_many(commands)
+        self.assertEqual(await asyncio.gather(*futures), [True, False, True, True, True])
+        self.assertLess(receiver.writes, len(commands))
+
+        future = await commander.send(commands[0])
+        self.assertTrue(await future)
+        self.assertEqual(len(msgs), 6)
+
+        # Fail the commands still waiting at the end of the stream
+        receiver.write = lambda data: None
+        future = await commander.send(commands[0])
+        receiver.close()
+        await task
+        with self.assertRaises(IOError):
+            await future
+
+    async def test_send_failure(self):
+        parser = Parser([CFG_CLS])
+        receiver = AsyncReceiver()
+        commander = AsyncCommander(parser, receiver, receiver, window=1)
+        task = asyncio.ensure_future(commander.run())
+
+        # Invalid commands do not keep their place in the window
+        with self.assertRaises(ValueError):
+            await commander.send({})
+        with self.assertRaises(ValueError):
+            await commander.send_many([{}])
+        bad = parser.prepare_msg('CFG', 'MSG')
+        bad['rate'] = 0x100
+        with self.assertRaises(struct.error):
+            await commander.send(bad)
+        self.assertEqual(len(commander), 0)
+
+        future = await asyncio.wait_for(commander.send(parser.prepare_msg('CFG', 'MSG')), 1)
+        self.assertTrue(await future)
+
+        # The places of the commands failed at the end of the stream are released
+        receiver.write = lambda data: None
+        future = await commander.send(parser.prepare_msg('CFG', 'MSG'))
+        receiver.close()
+        await task
+        with self.assertRaises(IOError):
+            await future
+        self.assertFalse(commander._slots.locked())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,23 @@
 """Basic unit testing of the core module"""
 
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from itertools import permutations
 import struct
+from array import array
 from io import BytesIO
 
 from ubxtranslator.core import *
+from ubxtranslator.core import _numpy
+from ubxtranslator.tests.helpers import packet
+
+numpy = _numpy()
 
 
 class UbxMsgTester(unittest.TestCase):
@@ -109,6 +121,360 @@ class UbxMsgTester(unittest.TestCase):
 
                 self.assertEqual(resp.F3, ((i * 4) + 4) & 0xFF)
 
+    def test_check_payload_length(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U2'),
+            RepeatedBlock('RB', [
+                Field('F2', 'U4'),
+                PadByte(),
+            ]),
+            Field('F3', 'U1'),
+        ])
+
+        for blocks in range(1, 100):
+            with self.subTest(blocks=blocks):
+                self.assertEqual(m.check_payload_length(3 + (5 * blocks)), blocks - 1)
+
+        for length in (0, 3, 7, 9, 12, 3 + (5 * 100) + 1):
+            with self.subTest(length=length):
+                with self.assertRaises(ValueError):
+                    m.check_payload_length(length)
+
+        m = Message(1, 'TEST', [Field('F1', 'U2')])
+        self.assertEqual(m.check_payload_length(2), 0)
+        for length in (0, 1, 3, 4):
+            with self.subTest(length=length):
+                with self.assertRaises(ValueError):
+                    m.check_payload_length(length)
+
+    def test_length_range(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U2'),
+            RepeatedBlock('RB', [
+                Field('F2', 'U4'),
+                PadByte(),
+            ]),
+            Field('F3', 'U1'),
+        ])
+        self.assertEqual(m.length_range(), (8, 0xFFFF - (0xFFFF - 8) % 5, 5))
+        self.assertEqual(m.length_range(20), (8, 18, 5))
+        self.assertLess(m.length_range(7)[1], 8)
+
+        m = Message(1, 'TEST', [Field('F1', 'U2')])
+        self.assertEqual(m.length_range(), (2, 2, 0))
+        self.assertLess(m.length_range(1)[1], 2)
+
+    def test_msg_pickle(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U1'),
+            BitField('B', 'X1', [Flag('L', 0, 4), Flag('H', 4, 8)]),
+            RepeatedBlock('RB', [Field('F2', 'U2')]),
+        ])
+        payload = bytes([1, 0x21, 2, 0, 3, 0])
+
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                if compiled:
+                    m.compile()
+                copy = pickle.loads(pickle.dumps(m))
+                self.assertEqual(copy.parse(payload), m.parse(payload))
+                self.assertEqual(copy._decoder is not None, compiled)
+
+        name, nt = m.parse(payload)
+        copy = pickle.loads(pickle.dumps(nt))
+        self.assertEqual(copy, nt)
+        self.assertIs(type(copy), type(nt))
+        self.assertIs(type(copy.B), type(nt.B))
+
+    def test_msg_types_created_on_first_use(self):
+        m = Message(1, 'LAZY_TEST', [
+            Field('F1', 'U1'),
+            RepeatedBlock('LAZY_RB', [BitField('LAZY_B', 'X1', [Flag('L', 0, 4)])]),
+        ])
+        self.assertIsNone(m._nt_type)
+        self.assertIsNone(m._fields[1]._nt_type)
+
+        name, nt = m.parse(bytes([1, 0x05]))
+        self.assertEqual(nt.LAZY_RB[0].LAZY_B.L, 5)
+        self.assertIs(m._nt_type, type(nt))
+
+        # A payload can be unpickled where its type has not been created yet
+        import ubxtranslator.core as core
+        data = pickle.dumps(nt)
+        for key in ('LAZY_TEST F1 LAZY_RB', 'LAZY_RB LAZY_B', 'LAZY_B L'):
+            del core._payload_types.__dict__[key]
+        copy = pickle.loads(data)
+        self.assertEqual(copy, nt)
+        self.assertIs(type(copy), core._payload_types.__dict__['LAZY_TEST F1 LAZY_RB'])
+
+        with self.assertRaises(AttributeError):
+            core._payload_types.__wrapped__
+
+    def test_predefined_built_on_access(self):
+        from ubxtranslator import predefined
+        self.assertIs(predefined.NAV_CLS, predefined.NAV_CLS)
+        self.assertIn('ESF_CLS', dir(predefined))
+        with self.assertRaises(AttributeError):
+            predefined.CFG_CLS
+
+    def test_msg_packed(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U1'),
+            Field('F2', 'U4'),
+            RepeatedBlock('RB', [
+                Field('F3', 'U1'),
+                Field('F4', 'I2'),
+            ]),
+            Field('F5', 'R8'),
+        ])
+
+        self.assertEqual(m.fmt, '<BIBhd')
+        self.assertEqual(struct.calcsize(m.fmt), 16)
+
+        values = {'F1': 1, 'F2': 2, 'RB': [{'F3': 3, 'F4': -4}, {'F3': 5, 'F4': -6}], 'F5': 7.5}
+        payload = m.pack(values)
+        self.assertEqual(payload, struct.pack('<BIBhBhd', 1, 2, 3, -4, 5, -6, 7.5))
+
+        name, resp = m.parse(payload)
+        self.assertEqual((resp.F1, resp.F2, resp.F5), (1, 2, 7.5))
+        self.assertEqual([(rb.F3, rb.F4) for rb in resp.RB], [(3, -4), (5, -6)])
+
+    def test_msg_compile(self):
+        bitfield = BitField('B', 'X2', [
+            Flag('SF1', 0, 3),
+            Flag('SF2', 3, 4),
+            Flag('SF3', 8, 16),
+        ])
+        messages = [
+            Message(1, 'PLAIN', [Field('F1', 'I4'), PadByte(repeat=2), Field('F2', 'R8'), Field('F3', 'C')]),
+            Message(2, 'BITS', [Field('F1', 'U1'), bitfield]),
+            Message(3, 'REPEATED', [
+                Field('F1', 'U1'),
+                RepeatedBlock('RB', [Field('F2', 'U2'), PadByte(), bitfield]),
+                Field('F3', 'I2'),
+            ]),
+            Message(4, 'PLAIN_REPEATED', [RepeatedBlock('RB', [Field('F1', 'R4'), PadByte()])]),
+            Message(5, 'PAD_REPEATED', [Field('F1', 'U1'), RepeatedBlock('RB', [PadByte()])]),
+        ]
+
+        for m in messages:
+            for blocks in range(1, 4 if m._repeated_block else 2):
+                with self.subTest(msg=m.name, blocks=blocks):
+                    payload = bytes(range(m._fixed_size + (m._block_size * blocks)))
+                    expected = m.parse(payload)
+                    packed = m.pack(expected[1])
+                    self.assertEqual(m.pack(expected[1]._asdict()), packed)
+                    self.assertIs(m.compile(), m)
+                    self.assertEqual(m.parse(payload), expected)
+                    self.assertEqual(m.pack(expected[1]), packed)
+                    self.assertEqual(m.pack(expected[1]._asdict()), packed)
+                    m._decoder = None
+                    m._encoder = None
+
+    def test_msg_repeated_threads(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U1'),
+            RepeatedBlock('RB', [
+                Field('F2', 'U2'),
+            ]),
+        ])
+        payloads = [bytes([blocks]) + struct.pack('<{}H'.format(blocks), *range(blocks)) for blocks in range(1, 50)]
+
+        def decode(payload):
+            for _ in range(50):
+                _, resp = m.parse(payload)
+                if resp.F1 != len(resp.RB) or [rb.F2 for rb in resp.RB] != list(range(resp.F1)):
+                    return False
+                if m.pack(resp) != payload:
+                    return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.assertTrue(all(pool.map(decode, payloads * 4)))
+
+        self.assertEqual(m._repeated_block.repeat, 0)
+
+    def test_msg_columns(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U1'),
+            RepeatedBlock('RB', [
+                Field('F2', 'I2'),
+                PadByte(),
+                Field('F3', 'R4'),
+                Field('F4', 'C'),
+                BitField('F5', 'X1', [
+                    Flag('SF1', 0, 4),
+                    Flag('SF2', 4, 8),
+                ]),
+            ]),
+            Field('F6', 'U2'),
+        ])
+
+        for blocks in (1, 2, 10):
+            with self.subTest(blocks=blocks):
+                rows = [{'F2': -i, 'F3': i / 2, 'F4': bytes([65 + i]), 'F5': {'SF1': i & 0xF, 'SF2': 15 - i}}
+                        for i in range(blocks)]
+                payload = m.pack({'F1': 3, 'RB': rows, 'F6': 600})
+
+                _, expected = m.parse(payload)
+                name, resp = m.parse_columns(payload)
+
+                self.assertEqual(name, 'TEST')
+                self.assertEqual((resp.F1, resp.F6), (3, 600))
+                self.assertIsInstance(resp.RB.F2, array)
+                self.assertEqual(list(resp.RB.F2), [rb.F2 for rb in expected.RB])
+                self.assertEqual(list(resp.RB.F3), [rb.F3 for rb in expected.RB])
+                self.assertEqual(resp.RB.F4, [rb.F4 for rb in expected.RB])
+                self.assertEqual(list(resp.RB.F5.SF1), [rb.F5.SF1 for rb in expected.RB])
+                self.assertEqual(list(resp.RB.F5.SF2), [rb.F5.SF2 for rb in expected.RB])
+
+        plain = Message(2, 'PLAIN', [Field('F1', 'U1')])
+        self.assertEqual(plain.parse_columns(b'\x05'), plain.parse(b'\x05'))
+
+        parser = Parser([Cls(1, 'TEST', [m, plain])], columnar=True)
+        payload = m.pack({'F1': 3, 'RB': rows[:2], 'F6': 600})
+        _, _, resp = parser.receive_from(BytesIO(packet(1, 1, payload)))
+        self.assertEqual(list(resp.RB.F2), [0, -1])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_msg_array(self):
+        m = Message(1, 'TEST', [
+            Field('F1', 'U1'),
+            PadByte(repeat=1),
+            Field('F2', 'I4'),
+            BitField('F3', 'X2', [
+                Flag('SF1', 0, 4),
+                Flag('SF2', 4, 12),
+            ]),
+            Field('F4', 'R8'),
+        ])
+
+        dtype = m.dtype()
+        self.assertEqual(dtype.itemsize, 17)
+        self.assertEqual(dtype.names, ('F1', 'F2', 'F3', 'F4'))
+
+        values = [{'F1': i, 'F2': -i, 'F3': {'SF1': i & 0xF, 'SF2': i * 3}, 'F4': i / 4} for i in range(20)]
+        arr = m.parse_array(b''.join(m.pack(v) for v in values))
+
+        self.assertEqual(len(arr), 20)
+        for row, v in zip(arr, values):
+            _, expected = m.parse(m.pack(v))
+            self.assertEqual(row['F1'], expected.F1)
+            self.assertEqual(row['F2'], expected.F2)
+            self.assertEqual(row['F3']['SF1'], expected.F3.SF1)
+            self.assertEqual(row['F3']['SF2'], expected.F3.SF2)
+            self.assertEqual(row['F4'], expected.F4)
+
+        with self.assertRaises(ValueError):
+            m.parse_array(bytes(18))
+
+        with self.assertRaises(ValueError):
+            Message(2, 'CLASH', [Field('F1', 'U1'), RepeatedBlock('RB', [Field('F1', 'U1')])]).dtype()
+
+        parser = Parser([Cls(1, 'TEST', [m])])
+        packets = [packet(1, 1, m.pack(v)) for v in values]
+        arr = parser.decode_array(b'junk'.join(packets), 'TEST', 'TEST')
+        self.assertEqual(list(arr['F1']), list(range(20)))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_msg_array_repeated(self):
+        m = Message(2, 'REPEATED', [
+            Field('F1', 'U4'),
+            RepeatedBlock('RB', [
+                BitField('F2', 'X4', [Flag('SF1', 0, 24), Flag('SF2', 24, 30)]),
+                Field('F3', 'U4'),
+            ]),
+            Field('F4', 'I2'),
+        ])
+        self.assertEqual(m.dtype().names, ('F1', 'F2', 'F3', 'F4'))
+
+        values = [{'F1': i, 'RB': [{'F2': {'SF1': i * 10 + j, 'SF2': j}, 'F3': j} for j in range(i + 1)], 'F4': -i}
+                  for i in range(4)]
+        arr = m.parse_array([m.pack(v) for v in values])
+
+        self.assertEqual(len(arr), 1 + 2 + 3 + 4)
+        self.assertEqual(list(arr['F1']), [0, 1, 1, 2, 2, 2, 3, 3, 3, 3])
+        self.assertEqual(list(arr['F4']), [0, -1, -1, -2, -2, -2, -3, -3, -3, -3])
+        self.assertEqual(list(arr['F2']['SF1']), [0, 10, 11, 20, 21, 22, 30, 31, 32, 33])
+        self.assertEqual(list(arr['F2']['SF2']), [0, 0, 1, 0, 1, 2, 0, 1, 2, 3])
+        self.assertEqual(list(arr['F3']), list(arr['F2']['SF2']))
+
+        # A message with no fields outside of the block
+        block_only = Message(4, 'PR', [RepeatedBlock('RB', [Field('F1', 'U2'), PadByte()])])
+        arr = block_only.parse_array([block_only.pack({'RB': [{'F1': i} for i in range(n)]}) for n in (1, 3)])
+        self.assertEqual(list(arr['F1']), [0, 0, 1, 2])
+        self.assertEqual(arr.dtype.names, ('F1',))
+
+        with self.assertRaises(ValueError):
+            m.parse_array(m.pack(values[0]))
+        with self.assertRaises(ValueError):
+            m.parse_array([bytes(7)])
+
+        parser = Parser([Cls(1, 'TEST', [m])])
+        packets = [packet(1, 2, m.pack(v)) for v in values]
+        arr = parser.decode_array(b'junk'.join(packets), 'TEST', 'REPEATED')
+        self.assertEqual(len(arr), 10)
+        self.assertEqual(list(arr['F1'][-4:]), [3] * 4)
+
+    @unittest.skipIf(numpy is not None, 'NumPy is installed')
+    def test_msg_array_without_numpy(self):
+        with self.assertRaises(ImportError):
+            Message(1, 'TEST', [Field('F1', 'U1')]).dtype()
+
+    def test_numpy_imported_lazily(self):
+        code = 'import sys, ubxtranslator.predefined; sys.exit("numpy" in sys.modules)'
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
+
+    def test_msg_lazy(self):
+        messages = [
+            Message(1, 'PLAIN', [
+                Field('F1', 'U1'),
+                PadByte(repeat=2),
+                Field('F2', 'R8'),
+                BitField('F3', 'X1', [
+                    Flag('SF1', 0, 4),
+                    Flag('SF2', 4, 8),
+                ]),
+                Field('F4', 'C'),
+            ]),
+            Message(2, 'REPEATED', [
+                Field('F1', 'I2'),
+                RepeatedBlock('RB', [
+                    Field('F2', 'U1'),
+                    BitField('F3', 'X2', [
+                        Flag('SF1', 0, 12),
+                    ]),
+                ]),
+                PadByte(),
+                Field('F4', 'I4'),
+            ]),
+        ]
+
+        for m in messages:
+            for blocks in range(1, 4 if m._repeated_block else 2):
+                with self.subTest(msg=m.name, blocks=blocks):
+                    payload = bytes(range(m._fixed_size + (m._block_size * blocks)))
+                    _, expected = m.parse(payload)
+                    name, lazy = m.parse_lazy(payload)
+
+                    self.assertEqual(name, m.name)
+                    self.assertIsInstance(lazy, LazyPayload)
+                    self.assertEqual(lazy._fields, expected._fields)
+                    for field in expected._fields:
+                        self.assertEqual(getattr(lazy, field), getattr(expected, field))
+                    self.assertEqual(lazy._asdict(), dict(expected._asdict()))
+                    self.assertIn('F1=', repr(lazy))
+
+        with self.assertRaises(ValueError):
+            messages[0].parse_lazy(bytes(3))
+
+        with self.assertRaises(ValueError):
+            Parser([], columnar=True, lazy=True)
+
+        parser = Parser([Cls(1, 'TEST', messages)], lazy=True)
+        msgs = list(parser.decode_bytes(packet(1, 1, bytes(range(14)))))
+        self.assertEqual(msgs[0][2].F4, b'\x0d')
+
     def test_multiple_repeats(self):
         fields = [
             RepeatedBlock('RB1', [
@@ -241,3 +607,366 @@ class UbxParserTester(unittest.TestCase):
                 test_stream = BytesIO(test_packet)
 
                 parser.receive_from(test_stream)
+
+    def test_parser_buffered(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'TEST', [
+                PadByte(),
+                Field('F1', 'U1'),
+                Field('F2', 'I1'),
+                PadByte(),
+                Field('F3', 'U1'),
+                BitField('F4', 'X1', [
+                    Flag('SF1', 0, 4),
+                    Flag('SF2', 4, 8)
+                ])
+            ])
+        ])
+
+        good = packet(1, 1, bytes([0, 1, 2, 3, 4, 5]))
+
+        with self.subTest(msg='Test junk and several frames'):
+            parser = Parser([cls], buffered=True)
+            test_stream = BytesIO(b'\x00\xb5junk' + good + b'\xb5' + good + good)
+
+            for _ in range(3):
+                cls_name, msg_name, msg = parser.receive_from(test_stream)
+                self.assertEqual((cls_name, msg_name), ('TEST', 'TEST'))
+                self.assertEqual(msg.F1, 1)
+                self.assertEqual(msg.F4.SF1, 5)
+
+            with self.assertRaises(IOError):
+                parser.receive_from(test_stream)
+
+        with self.subTest(msg='Test frames split across reads'):
+            for size in range(1, len(good) + 1):
+                parser = Parser([cls], buffered=True, read_size=size)
+                test_stream = BytesIO(good * 3)
+                for _ in range(3):
+                    _, _, msg = parser.receive_from(test_stream)
+                    self.assertEqual(msg.F3, 4)
+
+        with self.subTest(msg='Test partial frame is kept after a failed read'):
+            parser = Parser([cls], buffered=True)
+            with self.assertRaises(IOError):
+                parser.receive_from(BytesIO(good[:7]))
+            _, _, msg = parser.receive_from(BytesIO(good[7:]))
+            self.assertEqual(msg.F2, 2)
+
+        with self.subTest(msg='Test invalid frames are skipped'):
+            parser = Parser([cls], buffered=True)
+            test_stream = BytesIO(
+                packet(2, 1, bytes([0, 1, 2, 3, 4, 5])) +
+                packet(1, 1, bytes([0, 1, 2, 3, 4, 5, 6])) +
+                good[:-1] + b'\x00' +
+                good
+            )
+            for _ in range(3):
+                with self.assertRaises(ValueError):
+                    parser.receive_from(test_stream)
+            _, _, msg = parser.receive_from(test_stream)
+            self.assertEqual(msg.F1, 1)
+
+    def test_parser_feed(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'TEST', [
+                Field('F1', 'U2'),
+                RepeatedBlock('RB', [
+                    Field('F2', 'U2'),
+                ]),
+            ])
+        ])
+
+        data = b''.join(packet(1, 1, bytes([n, 0] + [n, 0] * n)) for n in range(1, 6))
+
+        with self.subTest(msg='Test all messages are returned for any split'):
+            for size in range(1, len(data) + 1):
+                parser = Parser([cls])
+                msgs = []
+                for i in range(0, len(data), size):
+                    msgs.extend(parser.feed(data[i:i + size]))
+
+                self.assertEqual(len(msgs), 5)
+                for n, (cls_name, msg_name, msg) in enumerate(msgs, 1):
+                    self.assertEqual((cls_name, msg_name), ('TEST', 'TEST'))
+                    self.assertEqual(msg.F1, n)
+                    self.assertEqual([rb.F2 for rb in msg.RB], [n] * n)
+
+                self.assertEqual(len(parser._input_buffer), 0)
+
+        with self.subTest(msg='Test invalid frames are reported'):
+            parser = Parser([cls])
+            errors = []
+            bad = bytearray(packet(1, 1, bytes([1, 0, 1, 0])))
+            bad[-1] ^= 0xFF
+            msgs = parser.feed(b'junk' + packet(2, 1, bytes([1, 0, 1, 0])) + bytes(bad) + data[:-1], errors.append)
+            self.assertEqual(len(msgs), 4)
+            self.assertEqual(len(errors), 2)
+            self.assertEqual(len(parser.feed(data[-1:])), 1)
+
+    def test_parser_buffered_in_waiting(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'TEST', [
+                Field('F1', 'U4'),
+                Field('F2', 'U4'),
+            ])
+        ])
+
+        class TricklingStream:
+            """A pyserial like stream that only ever has one byte waiting."""
+            def __init__(self, data):
+                self.stream = BytesIO(data)
+                self.sizes = []
+
+            @property
+            def in_waiting(self):
+                return 1
+
+            def read(self, size):
+                self.sizes.append(size)
+                return self.stream.read(size)
+
+        good = packet(1, 1, bytes([1, 0, 0, 0, 2, 0, 0, 0]))
+
+        parser = Parser([cls], buffered=True)
+        test_stream = TricklingStream(good * 3)
+        for _ in range(3):
+            _, _, msg = parser.receive_from(test_stream)
+            self.assertEqual((msg.F1, msg.F2), (1, 2))
+
+        # One read for the header and one for the rest of each frame
+        self.assertEqual(test_stream.sizes, [8, 8] * 3)
+
+    def test_parser_buffered_socket_file(self):
+        cls = Cls(1, 'TEST', [Message(1, 'TEST', [Field('F1', 'U1')])])
+
+        for kwargs in ({'buffered': True}, {'resync': True}):
+            with self.subTest(**kwargs):
+                rsock, wsock = socket.socketpair()
+                rsock.settimeout(5)
+                try:
+                    # A frame waiting on a socket is received without waiting for a whole chunk
+                    wsock.sendall(packet(1, 1, b'\x07'))
+                    with rsock.makefile('rb') as stream:
+                        self.assertEqual(Parser([cls], **kwargs).receive_from(stream)[2].F1, 7)
+                finally:
+                    rsock.close()
+                    wsock.close()
+
+    def test_parser_feed_errors(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'TEST', [
+                Field('F1', 'U1'),
+            ])
+        ])
+
+        with self.subTest(msg='Test a buffered parser cannot be fed'):
+            with self.assertRaises(ValueError):
+                Parser([cls], buffered=True).feed(packet(1, 1, bytes([1])))
+
+        with self.subTest(msg='Test frames are not repeated after on_error raises'):
+            def on_error(err):
+                raise err
+
+            parser = Parser([cls])
+            with self.assertRaises(ValueError):
+                parser.feed(packet(1, 1, bytes([1])) + packet(2, 1, bytes([1])) + packet(1, 1, bytes([3])), on_error)
+
+            msgs = parser.feed(b'', on_error)
+            self.assertEqual([msg.F1 for _, _, msg in msgs], [3])
+
+    def test_checksum(self):
+        for size in [0, 1, 2, 8, 255, 256, 257, 1000, 2048, 2049, 5000, 8192, 65535]:
+            payload = bytes((i * 7919) & 0xFF for i in range(size))
+            expected = Parser._fletcher_checksum_reference(payload)
+            for buff in (payload, bytearray(payload), memoryview(payload)):
+                with self.subTest(size=size, type_=type(buff).__name__):
+                    self.assertEqual(Parser._generate_fletcher_checksum(buff), expected)
+
+        self.assertEqual(Parser._fletcher_checksum_reference(bytes([1, 1, 6, 0, 0, 1, 2, 3, 4, 5])), bytes([0x17, 0x66]))
+
+    def test_parser_decode_bytes(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'TEST', [
+                Field('F1', 'U1'),
+                RepeatedBlock('RB', [
+                    Field('F2', 'U1'),
+                ]),
+            ])
+        ])
+        parser = Parser([cls])
+
+        good = b''.join(packet(1, 1, bytes([n] + [n] * n)) for n in range(1, 4))
+        bad_checksum = bytearray(packet(1, 1, bytes([9, 9])))
+        bad_checksum[-1] ^= 0xFF
+        data = b'junk' + good + packet(2, 1, bytes([9, 9])) + bytes(bad_checksum) + good + good[:-3]
+
+        with self.subTest(msg='Test decode_bytes'):
+            errors = []
+            msgs = list(parser.decode_bytes(data, errors.append))
+            msgs_expected = msgs
+            self.assertEqual([msg.F1 for _, _, msg in msgs], [1, 2, 3, 1, 2, 3, 1, 2])
+            self.assertEqual(len(errors), 3)
+            self.assertEqual(len(list(parser.decode_bytes(data))), 8)
+
+        with self.subTest(msg='Test iter_file'):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'log.ubx')
+                with open(path, 'wb') as f:
+                    f.write(data)
+                errors = []
+                msgs = list(parser.iter_file(path, errors.append))
+                self.assertEqual([len(msg.RB) for _, _, msg in msgs], [1, 2, 3, 1, 2, 3, 1, 2])
+                self.assertEqual(len(errors), 3)
+
+                # The memory map can be closed while the frames are still in use
+                msgs = parser.iter_file(path)
+                _, _, msg = next(msgs)
+                msgs.close()
+                self.assertEqual(msg.RB[0].F2, 1)
+
+                # An exception raised by on_error is not hidden by the memory map failing to close
+                def on_error(err):
+                    raise KeyError('on_error')
+
+                with self.assertRaisesRegex(KeyError, 'on_error'):
+                    list(parser.iter_file(path, on_error))
+
+                with open(path, 'wb'):
+                    pass
+                self.assertEqual(list(parser.iter_file(path)), [])
+
+        with self.subTest(msg='Test compiled decoders with memoryview payloads'):
+            compiled = Parser([Cls(1, 'TEST', [Message(1, 'TEST', cls[1]._fields).compile()])])
+            self.assertEqual(list(compiled.decode_bytes(bytearray(data))), msgs_expected)
+
+    def test_parser_subscribe(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+            Message(2, 'TWO', [Field('F1', 'U2')]),
+        ])
+
+        bad = bytearray(packet(1, 2, b'\x00\x00'))
+        bad[-1] ^= 0xFF
+        data = packet(1, 1, b'\x01') + packet(1, 2, b'\x02\x00') + packet(9, 9, b'unknown') + bytes(bad) + \
+            packet(1, 1, b'\x03')
+
+        for subscription in ([(1, 1)], lambda header: header[:2] == b'\x01\x01'):
+            with self.subTest(subscription=subscription):
+                parser = Parser([cls])
+                parser.subscribe(subscription)
+                errors = []
+                msgs = parser.feed(data, errors.append)
+                self.assertEqual([(name, msg.F1) for _, name, msg in msgs], [('ONE', 1), ('ONE', 3)])
+                self.assertEqual(errors, [])
+
+                parser.subscribe(subscription, verify_checksum=True)
+                self.assertEqual(len(parser.feed(data, errors.append)), 2)
+                self.assertEqual(len(errors), 1)
+
+                parser.subscribe(None)
+                errors = []
+                self.assertEqual(len(parser.feed(data, errors.append)), 3)
+                self.assertEqual(len(errors), 2)
+
+        with self.subTest(msg='Test unbuffered receive_from'):
+            parser = Parser([cls])
+            parser.subscribe({(1, 1)})
+            test_stream = BytesIO(data)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 1)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 3)
+
+            parser.subscribe({(1, 1)}, verify_checksum=True)
+            test_stream = BytesIO(data)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 1)
+            with self.assertRaises(ValueError):
+                parser.receive_from(test_stream)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 3)
+
+    def test_parser_resync(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+            Message(2, 'TWO', [Field('F1', 'U2')]),
+        ])
+
+        # A frame cut short after its header, the next frame is read as its payload and checksum
+        cut = packet(1, 2, b'\x00\x00')[:6]
+        data = b'xx' + packet(1, 1, b'\x01') + cut + packet(1, 1, b'\x02') + packet(1, 1, b'\x03')
+
+        parser = Parser([cls])
+        self.assertEqual([msg.F1 for _, _, msg in parser.feed(data)], [1, 3])
+        self.assertEqual(parser.bad_frames, 1)
+        # The bad frame and the 5 bytes left of the frame it cut into
+        self.assertEqual(parser.discarded_bytes, 2 + 10 + 5)
+
+        parser = Parser([cls], resync=True)
+        errors = []
+        self.assertEqual([msg.F1 for _, _, msg in parser.feed(data, errors.append)], [1, 2, 3])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(parser.bad_frames, 1)
+        self.assertEqual(parser.discarded_bytes, 2 + 6)
+
+        parser = Parser([cls], resync=True)
+        self.assertEqual([msg.F1 for _, _, msg in parser.decode_bytes(data)], [1, 2, 3])
+        self.assertEqual(parser.discarded_bytes, 2 + 6)
+
+        with self.subTest(msg='Test receive_from'):
+            parser = Parser([cls], resync=True, read_size=5)
+            test_stream = BytesIO(data)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 1)
+            with self.assertRaises(ValueError):
+                parser.receive_from(test_stream)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 2)
+            self.assertEqual(parser.receive_from(test_stream)[2].F1, 3)
+            self.assertEqual(parser.discarded_bytes, 2 + 6)
+
+    def test_parser_max_length(self):
+        cls = Cls(1, 'TEST', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+            Message(2, 'MANY', [RepeatedBlock('RB', [Field('F1', 'U1')])]),
+        ])
+
+        good = packet(1, 1, b'\x07')
+        # The header claims a long payload, the parser must not wait for it
+        corrupt = Parser.PREFIX + struct.pack('<BBH', 1, 1, 60000)
+
+        for kwargs in ({}, {'buffered': True}, {'resync': True}):
+            with self.subTest(**kwargs):
+                parser = Parser([cls], **kwargs)
+                test_stream = BytesIO(corrupt + good)
+                with self.assertRaises(ValueError):
+                    parser.receive_from(test_stream)
+                self.assertEqual(parser.receive_from(test_stream)[2].F1, 7)
+
+        parser = Parser([cls], max_length=16)
+        errors = []
+        msgs = parser.feed(packet(1, 2, bytes(16)) + packet(1, 2, bytes(17)) + good, errors.append)
+        self.assertEqual([name for _, name, _ in msgs], ['MANY', 'ONE'])
+        self.assertEqual(len(msgs[0][2].RB), 16)
+        self.assertEqual(len(errors), 1)
+        self.assertIn('maximum', str(errors[0]))
+
+        parser.subscribe([(1, 1)])
+        errors = []
+        # A skipped frame claiming more than the maximum is invalid, rather than awaited
+        self.assertEqual(len(parser.feed(Parser.PREFIX + struct.pack('<BBH', 9, 9, 1000) + good, errors.append)), 1)
+        self.assertEqual(len(errors), 1)
+
+        # A message replaced after its class was registered is checked against its own length
+        parser = Parser([cls])
+        cls_copy = Cls(1, 'TEST', [Message(1, 'ONE', [Field('F1', 'U1')])])
+        parser.register_cls(cls_copy)
+        self.assertEqual(parser.feed(good)[0][2].F1, 7)
+        cls_copy.register_msg(Message(1, 'ONE', [Field('F1', 'U2')]))
+        self.assertEqual(parser.feed(packet(1, 1, b'\x08\x01'))[0][2].F1, 0x108)
+        self.assertEqual(parser.feed(good), [])
+
+        # A skipped frame of a registered message is checked against the length of that message
+        for kwargs in ({}, {'buffered': True}):
+            with self.subTest(msg='Test skipped frames', **kwargs):
+                parser = Parser([cls], **kwargs)
+                parser.subscribe([(1, 2)])
+                test_stream = BytesIO(corrupt + packet(1, 2, b'\x05'))
+                with self.assertRaises(ValueError):
+                    parser.receive_from(test_stream)
+                self.assertEqual(parser.receive_from(test_stream)[2].RB[0].F1, 5)
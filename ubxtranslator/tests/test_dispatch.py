@@ -0,0 +1,109 @@
+"""Basic unit testing of the dispatch module"""
+
+import os
+import tempfile
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.dispatch import Dispatcher
+from ubxtranslator.tests.helpers import packet
+
+
+class UbxDispatcherTester(unittest.TestCase):
+    def setUp(self):
+        self.nav = Cls(1, 'NAV', [
+            Message(1, 'ONE', [Field('F1', 'U1')]),
+            Message(2, 'TWO', [Field('F1', 'U2')]),
+        ])
+        self.parser = Parser([self.nav])
+        self.dispatcher = Dispatcher(self.parser)
+        self.data = packet(1, 1, b'\x01') + packet(1, 2, b'\x02\x00') + packet(1, 1, b'\x03')
+
+    def test_register(self):
+        one, every, raw = [], [], []
+        self.dispatcher.register(lambda c, m, p: one.append(p.F1), self.nav, self.nav[1])
+        self.dispatcher.register(lambda c, m, p: every.append((c, m, p.F1)), 1)
+        self.dispatcher.register(lambda c, m, p: raw.append(bytes(p)), 1, 2, raw=True)
+
+        self.assertEqual(self.dispatcher.feed(self.data[:10]), 1)
+        self.assertEqual(self.dispatcher.feed(self.data[10:]), 2)
+
+        self.assertEqual(one, [1, 3])
+        self.assertEqual(every, [(1, 1, 1), (1, 2, 2), (1, 1, 3)])
+        self.assertEqual(raw, [b'\x02\x00'])
+
+        with self.assertRaises(ValueError):
+            self.dispatcher.register(print, 2)
+        with self.assertRaises(ValueError):
+            self.dispatcher.register(print, 1, 3)
+
+    def test_decode_once(self):
+        decoded = []
+        for _ in range(2):
+            self.dispatcher.register(lambda c, m, p: decoded.append(p), 1, 1)
+        self.assertTrue(self.dispatcher.dispatch(1, 1, b'\x05'))
+        self.assertIs(decoded[0], decoded[1])
+
+        self.assertFalse(self.dispatcher.dispatch(1, 2, b'\x05\x00'))
+
+    def test_raw_only_not_decoded(self):
+        raw = []
+        self.dispatcher.register(lambda c, m, p: raw.append(bytes(p)), 1, 2, raw=True)
+        # Would fail to decode as the payload is too short
+        self.assertTrue(self.dispatcher.dispatch(1, 2, b'\x05'))
+        self.assertEqual(raw, [b'\x05'])
+
+    def test_unregister(self):
+        calls = []
+
+        def handler(c, m, p):
+            calls.append(m)
+
+        self.dispatcher.register(handler, 1)
+        self.dispatcher.unregister(handler)
+        self.assertEqual(self.dispatcher.dispatch_bytes(self.data), 0)
+        self.assertEqual(calls, [])
+
+    def test_subscribe(self):
+        calls = []
+        self.dispatcher.register(lambda c, m, p: calls.append(p.F1), 1, 2)
+        self.dispatcher.subscribe()
+        self.assertEqual(self.parser.feed(self.data)[0][2].F1, 2)
+        self.assertEqual(self.dispatcher.feed(self.data), 1)
+        self.assertEqual(calls, [2])
+
+    def test_dispatch_file(self):
+        calls = []
+        self.dispatcher.register(lambda c, m, p: calls.append(bytes(p)), 1, raw=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'capture.ubx')
+            with open(path, 'wb') as f:
+                f.write(self.data)
+            self.assertEqual(self.dispatcher.dispatch_file(path), 3)
+
+            open(path, 'wb').close()
+            self.assertEqual(self.dispatcher.dispatch_file(path), 0)
+
+        self.assertEqual(calls, [b'\x01', b'\x02\x00', b'\x03'])
+
+    def test_dispatch_file_handler_error(self):
+        def handler(c, m, p):
+            raise KeyError('handler')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'capture.ubx')
+            with open(path, 'wb') as f:
+                f.write(self.data)
+
+            # The exception of a handler is not hidden by the memory map failing to close
+            for raw in (True, False):
+                with self.subTest(raw=raw):
+                    self.dispatcher.register(handler, 1, raw=raw)
+                    with self.assertRaisesRegex(KeyError, 'handler'):
+                        self.dispatcher.dispatch_file(path)
+                    self.dispatcher.unregister(handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
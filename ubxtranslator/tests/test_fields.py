@@ -141,7 +141,7 @@ class UbxRepeatedBlockTester(unittest.TestCase):
         for i in range(10):
             with self.subTest(i=i):
                 rb.repeat = i
-                self.assertEqual(rb.fmt, 'BxxB' * (i + 1))
+                self.assertEqual(rb.fmt, '<' + 'BxxB' * (i + 1))
 
     def test_parse(self):
         rb = RepeatedBlock('RB', fields=[
@@ -0,0 +1,109 @@
+"""Basic unit testing of the index module"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.index import FrameIndex
+from ubxtranslator.tests.helpers import packet
+
+
+class UbxFrameIndexTester(unittest.TestCase):
+    def setUp(self):
+        self.parser = Parser([
+            Cls(1, 'NAV', [
+                Message(1, 'TIME', [Field('iTOW', 'U4'), Field('F1', 'U1')]),
+                Message(2, 'OTHER', [Field('F1', 'U2')]),
+            ])
+        ])
+
+        bad = bytearray(packet(1, 1, struct.pack('<IB', 5, 5)))
+        bad[-1] ^= 0xFF
+
+        self.data = b''.join([
+            b'junk',
+            packet(1, 1, struct.pack('<IB', 1000, 1)),
+            packet(1, 2, struct.pack('<H', 7)),
+            packet(9, 9, b'unregistered'),
+            bytes(bad),
+            packet(1, 1, struct.pack('<IB', 2000, 2)),
+            packet(1, 1, struct.pack('<IB', 3000, 3)),
+            b'\xb5\x62\x01',
+        ])
+
+    def test_build(self):
+        index = FrameIndex.build(self.data, self.parser)
+
+        self.assertEqual(len(index), 5)
+        self.assertEqual(list(index.cls_ids), [1, 1, 9, 1, 1])
+        self.assertEqual(list(index.msg_ids), [1, 2, 9, 1, 1])
+        self.assertEqual(list(index.lengths), [5, 2, 12, 5, 5])
+        self.assertEqual(list(index.itows), [1000, FrameIndex.NO_ITOW, FrameIndex.NO_ITOW, 2000, 3000])
+        for offset in index.offsets:
+            self.assertEqual(self.data[offset:offset + 2], Parser.PREFIX)
+
+        index = FrameIndex.build(self.data)
+        self.assertEqual(list(index.itows), [FrameIndex.NO_ITOW] * 5)
+
+    def test_query(self):
+        index = FrameIndex.build(self.data, self.parser)
+
+        self.assertEqual(list(index.select(cls_id=1, msg_id=1)), [0, 3, 4])
+        self.assertEqual(list(index.select(itow_min=1500, itow_max=3000)), [3, 4])
+        self.assertEqual(list(index.select(cls_id=9)), [2])
+
+        msgs = list(index.query(self.parser, self.data, 1, 1, itow_max=2500))
+        self.assertEqual([msg.F1 for _, _, msg in msgs], [1, 2])
+
+        # Unregistered frames are indexed but not decoded
+        self.assertEqual(len(list(index.query(self.parser, self.data))), 4)
+
+        # Frames with the wrong length for their message are indexed but skipped
+        data = self.data + packet(1, 1, struct.pack('<I', 4000)) + packet(1, 1, struct.pack('<IB', 5000, 5))
+        index = FrameIndex.build(data, self.parser)
+        self.assertEqual(len(index), 7)
+        errors = []
+        msgs = list(index.query(self.parser, data, 1, 1, itow_min=3000, on_error=errors.append))
+        self.assertEqual([msg.iTOW for _, _, msg in msgs], [3000, 5000])
+        self.assertEqual(len(errors), 1)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'log.ubx')
+            with open(path, 'wb') as f:
+                f.write(self.data)
+
+            index = FrameIndex.for_file(path, self.parser)
+            self.assertTrue(os.path.exists(path + FrameIndex.SUFFIX))
+
+            loaded = FrameIndex.load(path + FrameIndex.SUFFIX)
+            for a, b in zip(index._arrays(), loaded._arrays()):
+                self.assertEqual(a, b)
+
+            msgs = list(loaded.query_file(self.parser, path, itow_min=3000))
+            self.assertEqual([msg.iTOW for _, _, msg in msgs], [3000])
+
+            # A stale index is rebuilt
+            with open(path, 'ab') as f:
+                f.write(packet(1, 1, struct.pack('<IB', 4000, 4)))
+            self.assertEqual(len(FrameIndex.for_file(path, self.parser)), 6)
+            self.assertEqual(len(FrameIndex.load(path + FrameIndex.SUFFIX)), 6)
+
+            # A capture rewritten with the same size is indexed again
+            with open(path, 'r+b') as f:
+                f.write(packet(1, 1, struct.pack('<IB', 500, 0)))
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            msgs = list(FrameIndex.for_file(path, self.parser).query_file(self.parser, path, itow_max=1000))
+            self.assertEqual([msg.iTOW for _, _, msg in msgs], [500])
+
+            with open(path + FrameIndex.SUFFIX, 'wb') as f:
+                f.write(b'not an index')
+            with self.assertRaises(ValueError):
+                FrameIndex.load(path + FrameIndex.SUFFIX)
+            self.assertEqual(len(FrameIndex.for_file(path, self.parser)), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
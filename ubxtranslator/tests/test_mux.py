@@ -0,0 +1,70 @@
+"""Basic unit testing of the mux module"""
+
+import os
+import socket
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.mux import Multiplexer
+from ubxtranslator.tests.helpers import packet
+
+
+class UbxMultiplexerTester(unittest.TestCase):
+    def setUp(self):
+        self.cls = Cls(1, 'TEST', [Message(1, 'ONE', [Field('F1', 'U1')])])
+        self.closed = []
+        self.errors = []
+        self.mux = Multiplexer([self.cls], on_error=lambda *err: self.errors.append(err),
+                               on_close=self.closed.append)
+
+    def tearDown(self):
+        self.mux.close()
+
+    def test_sources(self):
+        rsock, wsock = socket.socketpair()
+        rfd, wfd = os.pipe()
+        pipe = os.fdopen(rfd, 'rb')
+        try:
+            self.mux.add('sock', rsock)
+            self.mux.add('pipe', pipe)
+            self.assertEqual(len(self.mux), 2)
+            with self.assertRaises(ValueError):
+                self.mux.add('sock', rsock)
+
+            sock_data = packet(1, 1, b'\x01') + packet(1, 1, b'\x02')
+            pipe_data = packet(1, 1, b'\x03') + packet(9, 9, b'')
+            # Partial frames of each source are kept apart
+            wsock.sendall(sock_data[:5])
+            os.write(wfd, pipe_data[:5])
+            self.assertEqual(self.mux.poll(1), [])
+
+            wsock.sendall(sock_data[5:])
+            os.write(wfd, pipe_data[5:])
+            wsock.close()
+            os.close(wfd)
+
+            msgs = sorted((source_id, msg.F1) for source_id, _, _, msg in self.mux.messages(1))
+            self.assertEqual(msgs, [('pipe', 3), ('sock', 1), ('sock', 2)])
+            self.assertEqual(sorted(self.closed), ['pipe', 'sock'])
+            self.assertEqual(len(self.mux), 0)
+            self.assertEqual([source_id for source_id, _ in self.errors], ['pipe'])
+        finally:
+            rsock.close()
+            pipe.close()
+
+    def test_timeout(self):
+        rsock, wsock = socket.socketpair()
+        try:
+            self.mux.add(0, rsock)
+            self.assertEqual(self.mux.poll(0), [])
+            self.assertEqual(list(self.mux.messages(0)), [])
+
+            self.mux.remove(0)
+            self.assertEqual(len(self.mux), 0)
+        finally:
+            rsock.close()
+            wsock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Basic unit testing of the parallel module"""
+
+import multiprocessing
+import os
+import struct
+import tempfile
+import unittest
+
+from ubxtranslator.core import *
+from ubxtranslator.parallel import decode_file, shard_offsets
+from ubxtranslator.tests.helpers import packet
+
+
+def classes():
+    return [Cls(1, 'TEST', [
+        Message(1, 'ONE', [Field('F1', 'U2'), BitField('B', 'X1', [Flag('L', 0, 4), Flag('H', 4, 8)])]),
+        Message(2, 'MANY', [Field('F1', 'U1'), RepeatedBlock('RB', [Field('F2', 'U2')])]),
+    ])]
+
+
+def count(msgs):
+    return len(msgs)
+
+
+class UbxParallelTester(unittest.TestCase):
+    def setUp(self):
+        frames = []
+        for i in range(500):
+            frames.append(packet(1, 1, struct.pack('<HB', i, i & 0xFF)))
+            frames.append(packet(1, 2, struct.pack('<B', i & 0xFF) + struct.pack('<H', i) * (i % 5 + 1)))
+            if i % 50 == 0:
+                # Junk, an unregistered frame and a corrupt frame between the valid ones
+                bad = bytearray(packet(1, 1, b'\x00\x00\x00'))
+                bad[-1] ^= 0xFF
+                frames.append(b'\xb5junk' + packet(9, 9, b'\xb5\x62\x01\x01') + bytes(bad))
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'capture.ubx')
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(frames))
+
+        with open(self.path, 'rb') as f:
+            self.expected = list(Parser(classes()).decode_bytes(f.read()))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shard_offsets(self):
+        size = os.path.getsize(self.path)
+        offsets = shard_offsets(self.path, 16)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], size)
+        self.assertEqual(offsets, sorted(offsets))
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for offset in offsets[1:-1]:
+            self.assertEqual(data[offset:offset + 2], Parser.PREFIX)
+
+    def test_decode_file(self):
+        for shards in (1, 3, 16, 200):
+            with self.subTest(shards=shards):
+                self.assertEqual(list(decode_file(self.path, classes(), processes=2, shards=shards)), self.expected)
+
+    def test_shard_size(self):
+        size = os.path.getsize(self.path)
+        counts = list(decode_file(self.path, classes(), processes=1, transform=count, shard_size=size // 10))
+        self.assertGreaterEqual(len(counts), 10)
+        self.assertEqual(sum(counts), len(self.expected))
+
+        # Stopping early leaves the ranges not submitted yet undecoded
+        msgs = decode_file(self.path, classes(), processes=1, shard_size=size // 10)
+        self.assertEqual(next(msgs), self.expected[0])
+        msgs.close()
+
+    def test_transform(self):
+        counts = list(decode_file(self.path, classes(), processes=2, shards=5, transform=count))
+        self.assertEqual(len(counts), 5)
+        self.assertEqual(sum(counts), len(self.expected))
+
+    def test_spawn(self):
+        msgs = list(decode_file(self.path, [cls.compile() for cls in classes()], processes=2, shards=4,
+                                mp_context=multiprocessing.get_context('spawn')))
+        self.assertEqual(msgs, self.expected)
+
+    def test_columnar(self):
+        msgs = list(decode_file(self.path, classes(), processes=2, shards=4, columnar=True))
+        self.assertEqual([list(msg.RB.F2) for _, name, msg in msgs if name == 'MANY'],
+                         [[m.F2 for m in msg.RB] for _, name, msg in self.expected if name == 'MANY'])
+
+        with self.assertRaisesRegex(ValueError, 'pickled'):
+            list(decode_file(self.path, classes(), lazy=True))
+        with self.assertRaisesRegex(ValueError, 'streams'):
+            list(decode_file(self.path, classes(), buffered=True))
+
+    def test_empty(self):
+        open(self.path, 'wb').close()
+        self.assertEqual(shard_offsets(self.path, 4), [0, 0])
+        self.assertEqual(list(decode_file(self.path, classes())), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 import struct
 from io import BytesIO
@@ -38,6 +39,43 @@ class UbxTransferTester(unittest.TestCase):
         expected = struct.pack('<BBHH', 10, 0x21, 100, 200)
         self.assertEqual(payload, expected)
 
+    def test_pack_compiled(self):
+        values = [
+            {'F1': 10, 'F2': {'SF1': 1, 'SF2': 2}, 'RB': [{'RF1': 100}, {'RF1': 200}]},
+            {'F1': 10, 'RB': [{}, {'RF1': 5}]},
+            {'F1': None, 'F2': {'SF1': 3}, 'RB': [self.msg.parse(bytes(4))[1].RB[0]]},
+        ]
+        expected = [self.msg.pack(v) for v in values]
+        self.msg.compile()
+        self.assertEqual([self.msg.pack(v) for v in values], expected)
+
+        with self.assertRaises(ValueError):
+            self.msg.pack({'F1': 1, 'RB': []})
+
+    def test_pack_into(self):
+        prepared = self.parser.prepare_msg('TEST_CLS', 'TEST_MSG')
+        prepared['RB'] = [{'RF1': 1000}, {'RF1': 2000}]
+        expected = self.parser._pack_for_transfer(prepared)
+
+        for compiled in (False, True):
+            with self.subTest(compiled=compiled):
+                if compiled:
+                    self.cls.compile()
+                buff = bytearray(b'\xff' * 4)
+                length = self.parser.pack_into(prepared, buff, 2)
+                self.assertEqual(length, len(expected))
+                self.assertEqual(buff, b'\xff\xff' + expected)
+
+                # The buffer is reused without changing its length
+                prepared['F1'] = 7
+                self.assertEqual(self.parser.pack_into(prepared, buff, 2), length)
+                self.assertEqual(len(buff), 2 + length)
+                self.assertEqual(self.parser.receive_from(BytesIO(buff))[2].F1, 7)
+                prepared['F1'] = 0
+
+                with self.assertRaises(ValueError):
+                    self.parser.pack_into(prepared, memoryview(bytearray(4)))
+
     def test_round_trip(self):
         prepared = self.parser.prepare_msg('TEST_CLS', 'TEST_MSG')
         prepared['F1'] = 50
@@ -62,6 +100,54 @@ class UbxTransferTester(unittest.TestCase):
         self.assertEqual(resp.RB[1].RF1, 2000)
         self.assertEqual(resp.RB[2].RF1, 3000)
 
+    def test_transfer_many(self):
+        class Stream(BytesIO):
+            def __init__(self):
+                super().__init__()
+                self.writes = []
+
+            def write(self, data):
+                self.writes.append(len(data))
+                return super().write(data)
+
+        msg_dicts = []
+        for blocks in range(1, 6):
+            prepared = self.parser.prepare_msg('TEST_CLS', 'TEST_MSG')
+            prepared['F1'] = blocks
+            prepared['RB'] = [{'RF1': i} for i in range(blocks)]
+            msg_dicts.append(prepared)
+        expected = b''.join(self.parser._pack_for_transfer(msg_dict) for msg_dict in msg_dicts)
+        # Packet lengths are 12, 14, 16, 18 and 20 bytes
+
+        for max_chunk, writes in ((None, [80]), (40, [26, 34, 20]), (15, [12, 14, 15, 1, 15, 3, 15, 5])):
+            with self.subTest(max_chunk=max_chunk):
+                stream = Stream()
+                self.assertEqual(self.parser.transfer_many(msg_dicts, stream, max_chunk), len(expected))
+                self.assertEqual(stream.getvalue(), expected)
+                self.assertEqual(stream.writes, writes)
+
+        stream = Stream()
+        self.assertEqual(self.parser.transfer_many([], stream), 0)
+        self.assertEqual(stream.writes, [])
+
+    def test_transfer_many_async(self):
+        class Writer:
+            def __init__(self):
+                self.data = b''
+                self.drains = 0
+
+            def write(self, data):
+                self.data += data
+
+            async def drain(self):
+                self.drains += 1
+
+        msg_dicts = [self.parser.prepare_msg('TEST_CLS', 'TEST_MSG') for _ in range(3)]
+        writer = Writer()
+        asyncio.run(self.parser.transfer_many_async(msg_dicts, writer, 24))
+        self.assertEqual(writer.data, self.parser._pack_for_transfer(msg_dicts[0]) * 3)
+        self.assertEqual(writer.drains, 2)
+
     def test_checksum_error(self):
         prepared = self.parser.prepare_msg('TEST_CLS', 'TEST_MSG')
         stream = BytesIO()